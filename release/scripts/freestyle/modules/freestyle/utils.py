@@ -25,6 +25,7 @@ __all__ = (
     "angle_x_normal",
     "bound",
     "bounding_box",
+    "bounds_2d",
     "BoundingBox",
     "ContextFunctions",
     "curvature_from_stroke_vertex",
@@ -47,8 +48,11 @@ __all__ = (
     "phase_to_direction",
     "rgb_to_bw",
     "simplify",
+    "simplify_mask",
     "stroke_curvature",
     "stroke_normal",
+    "stroke_points_xy",
+    "StrokeAttributeCacheShader",
     "StrokeCollector",
     "tripplewise",
     )
@@ -69,6 +73,7 @@ from freestyle.types import (
     )
 
 from mathutils import Vector
+from array import array
 from functools import lru_cache, namedtuple
 from math import cos, sin, pi, atan2
 from itertools import tee, compress
@@ -142,8 +147,8 @@ def bounding_box(stroke):
     """
     Returns the maximum and minimum coordinates (the bounding box) of the stroke's vertices
     """
-    x, y = zip(*(svert.point for svert in stroke))
-    return (Vector((min(x), min(y))), Vector((max(x), max(y))))
+    xmin, ymin, xmax, ymax = bounds_2d(*stroke_points_xy(stroke))
+    return (Vector((xmin, ymin)), Vector((xmax, ymax)))
 
 
 def normal_at_I0D(it: Interface0DIterator) -> Vector:
@@ -235,44 +240,73 @@ def getSquareSegmentDistance(p, p1, p2):
     return dx * dx + dy * dy
 
 
-def simplifyDouglasPeucker(points, tolerance):
-    length = len(points)
-    markers = [0] * length
+def simplify_mask(xs, ys, sq_tolerance):
+    """
+    Douglas-Peucker simplification of the points (xs[i], ys[i]),
+    returns a bytearray, 1 for the points to keep.
+    sq_tolerance is the square of the maximum distance to the simplified line.
+    """
+    length = len(xs)
+    markers = bytearray(length)
+    if not length:
+        return markers
 
     first = 0
     last = length - 1
 
-    first_stack = []
-    last_stack = []
-
-    new_points = []
+    # stack of (first, last) index pairs still to be processed.
+    stack = []
 
     markers[first] = 1
     markers[last] = 1
 
     while last:
-        max_sqdist = 0
+        # inline getSquareSegmentDistance for all points of the segment.
+        x1 = xs[first]
+        y1 = ys[first]
+        dx = xs[last] - x1
+        dy = ys[last] - y1
+        sq_length = dx * dx + dy * dy
 
+        max_sqdist = 0
         for i in range(first, last):
-            sqdist = getSquareSegmentDistance(points[i], points[first], points[last])
+            x = xs[i]
+            y = ys[i]
+            if sq_length:
+                t = ((x - x1) * dx + (y - y1) * dy) / sq_length
+                if t > 1:
+                    px = x - xs[last]
+                    py = y - ys[last]
+                elif t > 0:
+                    px = x - (x1 + dx * t)
+                    py = y - (y1 + dy * t)
+                else:
+                    px = x - x1
+                    py = y - y1
+            else:
+                px = x - x1
+                py = y - y1
+            sqdist = px * px + py * py
 
             if sqdist > max_sqdist:
                 index = i
                 max_sqdist = sqdist
 
-        if max_sqdist > tolerance:
+        if max_sqdist > sq_tolerance:
             markers[index] = 1
 
-            first_stack.append(first)
-            last_stack.append(index)
+            stack.append((first, index))
+            stack.append((index, last))
+
+        first, last = stack.pop() if stack else (None, None)
 
-            first_stack.append(index)
-            last_stack.append(last)
+    return markers
 
-        first = first_stack.pop() if first_stack else None
-        last = last_stack.pop() if last_stack else None
 
-    return tuple(compress(points, markers))
+def simplifyDouglasPeucker(points, tolerance):
+    xs = array('d', (p[0] for p in points))
+    ys = array('d', (p[1] for p in points))
+    return tuple(compress(points, simplify_mask(xs, ys, tolerance)))
 
 
 def simplify(points, tolerance):
@@ -280,6 +314,24 @@ def simplify(points, tolerance):
     return simplifyDouglasPeucker(points, tolerance * tolerance)
 
 
+# -- array based kernels, taking the 2D points as separate x and y arrays -- #
+
+def stroke_points_xy(stroke):
+    """Returns the 2D coordinates of the stroke's vertices as two arrays: (xs, ys)"""
+    xs = array('d')
+    ys = array('d')
+    for svert in stroke:
+        x, y = svert.point
+        xs.append(x)
+        ys.append(y)
+    return xs, ys
+
+
+def bounds_2d(xs, ys):
+    """Returns the bounds of the points: (xmin, ymin, xmax, ymax)"""
+    return min(xs), min(ys), max(xs), max(ys)
+
+
 class BoundingBox:
     """Object representing a bounding box consisting out of 2 2D vectors"""
 
@@ -327,6 +379,65 @@ class StrokeCollector(StrokeShader):
         self.strokes.append(stroke)
 
 
+class _StrokeAttributeCache:
+    """Vertex attributes of one stroke, each computed once."""
+
+    __slots__ = (
+        "stroke",
+        "key",
+        "values",
+        )
+
+    def __init__(self, stroke):
+        self.stroke = stroke
+        self.key = _stroke_key(stroke)
+        self.values = {}
+
+    def get(self, key, func, *args):
+        """Returns the values for key, calling func(*args) to compute them when needed."""
+        values = self.values.get(key)
+        if values is None:
+            values = self.values[key] = tuple(func(*args))
+        return values
+
+    def stroke_vertices(self):
+        return self.get("stroke_vertices", iter, self.stroke)
+
+
+# Set by StrokeAttributeCacheShader for the stroke being shaded.
+_stroke_attribute_cache = None
+
+
+def _stroke_key(stroke):
+    # A new Python object wraps the stroke for each shader,
+    # so identify the stroke by its Id (and size, in case vertices changed).
+    stroke_id = stroke.id
+    return stroke_id.first, stroke_id.second, len(stroke)
+
+
+def _stroke_attribute_cache_get(stroke):
+    cache = _stroke_attribute_cache
+    if cache is not None and cache.key == _stroke_key(stroke):
+        return cache
+    return None
+
+
+class StrokeAttributeCacheShader(StrokeShader):
+    """
+    Caches the vertex attributes computed by the iter_* functions of this
+    module, so shaders that follow share them for the stroke being shaded.
+    Add one shader with clear=False before shaders that read attributes and
+    one with clear=True after them, before any shader changing the stroke geometry.
+    """
+    def __init__(self, clear=False):
+        StrokeShader.__init__(self)
+        self.clear = clear
+
+    def shade(self, stroke):
+        global _stroke_attribute_cache
+        _stroke_attribute_cache = None if self.clear else _StrokeAttributeCache(stroke)
+
+
 # -- helper functions for chaining -- #
 
 def get_chain_length(ve, orientation):
@@ -391,8 +502,7 @@ def tripplewise(iterable):
     return zip(a, b, c)
 
 
-def iter_t2d_along_stroke(stroke):
-    """Yields the progress along the stroke."""
+def _iter_t2d_along_stroke(stroke):
     total = stroke.length_2d
     distance = 0.0
     # yield for the comparison from the first vertex to itself
@@ -402,19 +512,39 @@ def iter_t2d_along_stroke(stroke):
         yield min(distance / total, 1.0) if total != 0.0 else 0.0
 
 
+def iter_t2d_along_stroke(stroke):
+    """Yields the progress along the stroke."""
+    cache = _stroke_attribute_cache_get(stroke)
+    if cache is None:
+        return _iter_t2d_along_stroke(stroke)
+    return iter(cache.get("t2d_along_stroke", _iter_t2d_along_stroke, stroke))
+
+
+def _iter_distance_from(svert_distances, range_min, range_max, normfac):
+    for svert, distance in svert_distances:
+        if range_min < distance < range_max:
+            yield (svert, (distance - range_min) / normfac)
+        else:
+            yield (svert, 0.0) if range_min > distance else (svert, 1.0)
+
+
 def iter_distance_from_camera(stroke, range_min, range_max, normfac):
     """
     Yields the distance to the camera relative to the maximum
     possible distance for every stroke vertex, constrained by
     given minimum and maximum values.
     """
-    for svert in stroke:
+    cache = _stroke_attribute_cache_get(stroke)
+    if cache is None:
         # length in the camera coordinate
-        distance = svert.point_3d.length
-        if range_min < distance < range_max:
-            yield (svert, (distance - range_min) / normfac)
-        else:
-            yield (svert, 0.0) if range_min > distance else (svert, 1.0)
+        svert_distances = ((svert, svert.point_3d.length) for svert in stroke)
+    else:
+        svert_distances = zip(cache.stroke_vertices(), cache.get(
+            "distance_from_camera",
+            (lambda sverts: (svert.point_3d.length for svert in sverts)),
+            cache.stroke_vertices(),
+            ))
+    return _iter_distance_from(svert_distances, range_min, range_max, normfac)
 
 
 def iter_distance_from_object(stroke, location, range_min, range_max, normfac):
@@ -423,60 +553,67 @@ def iter_distance_from_object(stroke, location, range_min, range_max, normfac):
     possible distance for every stroke vertex, constrained by
     given minimum and maximum values.
     """
-    for svert in stroke:
-        distance = (svert.point_3d - location).length  # in the camera coordinate
-        if range_min < distance < range_max:
-            yield (svert, (distance - range_min) / normfac)
-        else:
-            yield (svert, 0.0) if distance < range_min else (svert, 1.0)
+    cache = _stroke_attribute_cache_get(stroke)
+    if cache is None:
+        # in the camera coordinate
+        svert_distances = ((svert, (svert.point_3d - location).length) for svert in stroke)
+    else:
+        svert_distances = zip(cache.stroke_vertices(), cache.get(
+            ("distance_from_object", tuple(location)),
+            (lambda sverts: ((svert.point_3d - location).length for svert in sverts)),
+            cache.stroke_vertices(),
+            ))
+    return _iter_distance_from(svert_distances, range_min, range_max, normfac)
+
+
+# material attribute -> function returning the value from a material.
+_material_value_funcs = {
+    # main
+    'LINE': lambda material: rgb_to_bw(*material.line[0:3]),
+    'DIFF': lambda material: rgb_to_bw(*material.diffuse[0:3]),
+    'SPEC': lambda material: rgb_to_bw(*material.specular[0:3]),
+    # line separate
+    'LINE_R': lambda material: material.line[0],
+    'LINE_G': lambda material: material.line[1],
+    'LINE_B': lambda material: material.line[2],
+    'LINE_A': lambda material: material.line[3],
+    # diffuse separate
+    'DIFF_R': lambda material: material.diffuse[0],
+    'DIFF_G': lambda material: material.diffuse[1],
+    'DIFF_B': lambda material: material.diffuse[2],
+    'ALPHA': lambda material: material.diffuse[3],
+    # specular separate
+    'SPEC_R': lambda material: material.specular[0],
+    'SPEC_G': lambda material: material.specular[1],
+    'SPEC_B': lambda material: material.specular[2],
+    'SPEC_HARDNESS': lambda material: material.shininess,
+    }
+
+
+def _iter_materials(stroke, func):
+    it = Interface0DIterator(stroke)
+    for _svert in it:
+        yield func(it)
 
 
 def iter_material_value(stroke, func, attribute):
     """Yields a specific material attribute from the vertex' underlying material."""
-    it = Interface0DIterator(stroke)
-    for svert in it:
-        material = func(it)
-        # main
-        if attribute == 'LINE':
-            value = rgb_to_bw(*material.line[0:3])
-        elif attribute == 'DIFF':
-            value = rgb_to_bw(*material.diffuse[0:3])
-        elif attribute == 'SPEC':
-            value = rgb_to_bw(*material.specular[0:3])
-        # line separate
-        elif attribute == 'LINE_R':
-            value = material.line[0]
-        elif attribute == 'LINE_G':
-            value = material.line[1]
-        elif attribute == 'LINE_B':
-            value = material.line[2]
-        elif attribute == 'LINE_A':
-            value = material.line[3]
-        # diffuse separate
-        elif attribute == 'DIFF_R':
-            value = material.diffuse[0]
-        elif attribute == 'DIFF_G':
-            value = material.diffuse[1]
-        elif attribute == 'DIFF_B':
-            value = material.diffuse[2]
-        elif attribute == 'ALPHA':
-            value = material.diffuse[3]
-        # specular separate
-        elif attribute == 'SPEC_R':
-            value = material.specular[0]
-        elif attribute == 'SPEC_G':
-            value = material.specular[1]
-        elif attribute == 'SPEC_B':
-            value = material.specular[2]
-        elif attribute == 'SPEC_HARDNESS':
-            value = material.shininess
-        else:
-            raise ValueError("unexpected material attribute: " + attribute)
-        yield (svert, value)
+    value_func = _material_value_funcs.get(attribute)
+    if value_func is None:
+        raise ValueError("unexpected material attribute: " + attribute)
+
+    cache = _stroke_attribute_cache_get(stroke)
+    if cache is None:
+        it = Interface0DIterator(stroke)
+        for svert in it:
+            yield (svert, value_func(func(it)))
+    else:
+        materials = cache.get(("materials", type(func)), _iter_materials, stroke, func)
+        yield from zip(cache.stroke_vertices(), cache.get(
+            ("material_value", type(func), attribute), map, value_func, materials))
 
 
-def iter_distance_along_stroke(stroke):
-    """Yields the absolute distance along the stroke up to the current vertex."""
+def _iter_distance_along_stroke(stroke):
     distance = 0.0
     # the positions need to be copied, because they are changed in the calling function
     points = tuple(svert.point.copy() for svert in stroke)
@@ -486,6 +623,14 @@ def iter_distance_along_stroke(stroke):
         yield distance
 
 
+def iter_distance_along_stroke(stroke):
+    """Yields the absolute distance along the stroke up to the current vertex."""
+    cache = _stroke_attribute_cache_get(stroke)
+    if cache is None:
+        return _iter_distance_along_stroke(stroke)
+    return iter(cache.get("distance_along_stroke", _iter_distance_along_stroke, stroke))
+
+
 # -- mathematical operations -- #
 
 def stroke_curvature(it):
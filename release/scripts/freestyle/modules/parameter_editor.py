@@ -43,6 +43,7 @@ from freestyle.chainingiterators import (
     )
 from freestyle.functions import (
     Curvature2DAngleF0D,
+    CurveNatureF1D,
     Normal2DF0D,
     QuantitativeInvisibilityF1D,
     VertexOrientation2DF0D,
@@ -63,7 +64,6 @@ from freestyle.predicates import (
     TrueUP1D,
     WithinImageBoundaryUP1D,
     pyNFirstUP1D,
-    pyNatureUP1D,
     pyProjectedXBP1D,
     pyProjectedYBP1D,
     pyZBP1D,
@@ -101,8 +101,10 @@ from freestyle.utils import (
     iter_t2d_along_stroke,
     normal_at_I0D,
     pairwise,
-    simplify,
+    simplify_mask,
     stroke_normal,
+    stroke_points_xy,
+    StrokeAttributeCacheShader,
     )
 from _freestyle import (
     blendRamp,
@@ -116,7 +118,7 @@ import random
 
 from mathutils import Vector
 from math import pi, sin, cos, acos, radians, atan2
-from itertools import cycle, tee
+from itertools import compress, cycle, tee
 
 # WARNING: highly experimental, not a stable API
 # lists of callback functions
@@ -138,9 +140,62 @@ class ColorRampModifier(StrokeShader):
         col = evaluateColorRamp(self.ramp, t)
         return col.xyz  # omit alpha
 
+    def evaluate_array(self, values):
+        """Evaluates a sequence of values, returns a list of colors."""
+        ramp = self.ramp
+        return [evaluateColorRamp(ramp, t).xyz for t in values]
+
     def blend_ramp(self, a, b):
         return blendRamp(self.blend, a, self.influence, b)
 
+    def blend_color(self, stroke_values):
+        """
+        Blends the color of (svert, value) pairs, the values are
+        evaluated for the whole stroke at once (see: evaluate_array).
+        """
+        attributes = []
+        values = []
+        for svert, value in stroke_values:
+            attributes.append(svert.attribute)
+            values.append(value)
+        blend = self.blend
+        influence = self.influence
+        for attr, b in zip(attributes, self.evaluate_array(values)):
+            attr.color = blendRamp(blend, attr.color, influence, b)
+
+
+def _scalar_blend_function(blend_type, fac):
+    """Returns a function blending two values, see: ScalarBlendModifier.blend"""
+    facm = 1.0 - fac
+    if blend_type == 'MIX':
+        def blend(v1, v2):
+            return facm * v1 + fac * v2
+    elif blend_type == 'ADD':
+        def blend(v1, v2):
+            return v1 + fac * v2
+    elif blend_type == 'MULTIPLY':
+        def blend(v1, v2):
+            return v1 * (facm + fac * v2)
+    elif blend_type == 'SUBTRACT':
+        def blend(v1, v2):
+            return v1 - fac * v2
+    elif blend_type == 'DIVIDE':
+        def blend(v1, v2):
+            return facm * v1 + fac * v1 / v2 if v2 != 0.0 else v1
+    elif blend_type == 'DIFFERENCE':
+        def blend(v1, v2):
+            return facm * v1 + fac * abs(v1 - v2)
+    elif blend_type in {'MINIMUM', 'MININUM'}:
+        def blend(v1, v2):
+            return min(fac * v2, v1)
+    elif blend_type == 'MAXIMUM':
+        def blend(v1, v2):
+            return max(fac * v2, v1)
+    else:
+        def blend(v1, v2):
+            raise ValueError("unknown curve blend type: " + blend_type)
+    return blend
+
 
 class ScalarBlendModifier(StrokeShader):
     """Primitive for alpha and thickness modifiers."""
@@ -148,29 +203,20 @@ class ScalarBlendModifier(StrokeShader):
         StrokeShader.__init__(self)
         self.blend_type = blend_type
         self.influence = influence
+        # resolve the blend type once, instead of for every vertex.
+        self._blend_func = _scalar_blend_function(blend_type, influence)
 
     def blend(self, v1, v2):
-        fac = self.influence
-        facm = 1.0 - fac
-        if self.blend_type == 'MIX':
-            v1 = facm * v1 + fac * v2
-        elif self.blend_type == 'ADD':
-            v1 += fac * v2
-        elif self.blend_type == 'MULTIPLY':
-            v1 *= facm + fac * v2
-        elif self.blend_type == 'SUBTRACT':
-            v1 -= fac * v2
-        elif self.blend_type == 'DIVIDE':
-            v1 = facm * v1 + fac * v1 / v2 if v2 != 0.0 else v1
-        elif self.blend_type == 'DIFFERENCE':
-            v1 = facm * v1 + fac * abs(v1 - v2)
-        elif self.blend_type == 'MININUM':
-            v1 = min(fac * v2, v1)
-        elif self.blend_type == 'MAXIMUM':
-            v1 = max(fac * v2, v1)
-        else:
-            raise ValueError("unknown curve blend type: " + self.blend_type)
-        return v1
+        """Blends two values."""
+        return self._blend_func(v1, v2)
+
+    def blend_array(self, values1, values2):
+        """Blends two sequences of values, returns a list."""
+        return list(map(self._blend_func, values1, values2))
+
+
+# number of samples in CurveMappingModifier's lookup tables.
+CURVE_LUT_SIZE = 1024
 
 
 class CurveMappingModifier(ScalarBlendModifier):
@@ -180,12 +226,52 @@ class CurveMappingModifier(ScalarBlendModifier):
         self.evaluate = getattr(self, mapping)
         self.invert = invert
         self.curve = curve
+        self.curve_lut = self.curve_sample(curve) if mapping == 'CURVE' else None
+
+    @staticmethod
+    def curve_sample(curve):
+        """Returns a lookup table of the curve, sampled in the [0, 1] range."""
+        curve.initialize()
+        curve_map = curve.curves[0]
+        clip_min_y = curve.clip_min_y
+        clip_max_y = curve.clip_max_y
+        return [
+            bound(clip_min_y, curve.evaluate(curve=curve_map, position=i / CURVE_LUT_SIZE), clip_max_y)
+            for i in range(CURVE_LUT_SIZE + 1)
+        ]
+
+    def evaluate_array(self, values):
+        """Evaluates a sequence of values, returns a list."""
+        return list(map(self.evaluate, values))
+
+    def blend_alpha(self, stroke_values):
+        """
+        Blends the alpha of (svert, value) pairs, the values are
+        evaluated for the whole stroke at once (see: evaluate_array).
+        """
+        attributes = []
+        values = []
+        for svert, value in stroke_values:
+            attributes.append(svert.attribute)
+            values.append(value)
+        alphas = self.blend_array([attr.alpha for attr in attributes], self.evaluate_array(values))
+        for attr, alpha in zip(attributes, alphas):
+            attr.alpha = alpha
 
     def LINEAR(self, t):
         return (1.0 - t) if self.invert else t
 
     def CURVE(self, t):
         # deprecated: return evaluateCurveMappingF(self.curve, 0, t)
+        if 0.0 <= t <= 1.0:
+            # linear interpolation in the lookup table.
+            lut = self.curve_lut
+            x = t * CURVE_LUT_SIZE
+            i = int(x)
+            if i == CURVE_LUT_SIZE:
+                return lut[i]
+            return lut[i] + (lut[i + 1] - lut[i]) * (x - i)
+
         curve = self.curve
         curve.initialize()
         result = curve.evaluate(curve=curve.curves[0], position=t)
@@ -305,19 +391,13 @@ class BaseThicknessShader(StrokeShader, ThicknessModifierMixIn):
 class ColorAlongStrokeShader(ColorRampModifier):
     """Maps a ramp to the color of the stroke, using the curvilinear abscissa (t)."""
     def shade(self, stroke):
-        for svert, t in zip(stroke, iter_t2d_along_stroke(stroke)):
-            a = svert.attribute.color
-            b = self.evaluate(t)
-            svert.attribute.color = self.blend_ramp(a, b)
+        self.blend_color(zip(stroke, iter_t2d_along_stroke(stroke)))
 
 
 class AlphaAlongStrokeShader(CurveMappingModifier):
     """Maps a curve to the alpha/transparency of the stroke, using the curvilinear abscissa (t)."""
     def shade(self, stroke):
-        for svert, t in zip(stroke, iter_t2d_along_stroke(stroke)):
-            a = svert.attribute.alpha
-            b = self.evaluate(t)
-            svert.attribute.alpha = self.blend(a, b)
+        self.blend_alpha(zip(stroke, iter_t2d_along_stroke(stroke)))
 
 
 class ThicknessAlongStrokeShader(ThicknessBlenderMixIn, CurveMappingModifier):
@@ -343,11 +423,7 @@ class ColorDistanceFromCameraShader(ColorRampModifier):
         self.range = BoundedProperty(range_min, range_max)
 
     def shade(self, stroke):
-        it = iter_distance_from_camera(stroke, *self.range)
-        for svert, t in it:
-            a = svert.attribute.color
-            b = self.evaluate(t)
-            svert.attribute.color = self.blend_ramp(a, b)
+        self.blend_color(iter_distance_from_camera(stroke, *self.range))
 
 
 class AlphaDistanceFromCameraShader(CurveMappingModifier):
@@ -357,11 +433,7 @@ class AlphaDistanceFromCameraShader(CurveMappingModifier):
         self.range = BoundedProperty(range_min, range_max)
 
     def shade(self, stroke):
-        it = iter_distance_from_camera(stroke, *self.range)
-        for svert, t in it:
-            a = svert.attribute.alpha
-            b = self.evaluate(t)
-            svert.attribute.alpha = self.blend(a, b)
+        self.blend_alpha(iter_distance_from_camera(stroke, *self.range))
 
 
 class ThicknessDistanceFromCameraShader(ThicknessBlenderMixIn, CurveMappingModifier):
@@ -394,11 +466,7 @@ class ColorDistanceFromObjectShader(ColorRampModifier):
         self.loc = matrix @ target.location
 
     def shade(self, stroke):
-        it = iter_distance_from_object(stroke, self.loc, *self.range)
-        for svert, t in it:
-            a = svert.attribute.color
-            b = self.evaluate(t)
-            svert.attribute.color = self.blend_ramp(a, b)
+        self.blend_color(iter_distance_from_object(stroke, self.loc, *self.range))
 
 
 class AlphaDistanceFromObjectShader(CurveMappingModifier):
@@ -414,11 +482,7 @@ class AlphaDistanceFromObjectShader(CurveMappingModifier):
         self.loc = matrix @ target.location
 
     def shade(self, stroke):
-        it = iter_distance_from_object(stroke, self.loc, *self.range)
-        for svert, t in it:
-            a = svert.attribute.alpha
-            b = self.evaluate(t)
-            svert.attribute.alpha = self.blend(a, b)
+        self.blend_alpha(iter_distance_from_object(stroke, self.loc, *self.range))
 
 
 class ThicknessDistanceFromObjectShader(ThicknessBlenderMixIn, CurveMappingModifier):
@@ -466,10 +530,7 @@ class ColorMaterialShader(ColorRampModifier):
                 a = svert.attribute.color
                 svert.attribute.color = self.blend_ramp(a, b)
         else:
-            for svert, value in iter_material_value(stroke, self.func, self.attribute):
-                a = svert.attribute.color
-                b = self.evaluate(value)
-                svert.attribute.color = self.blend_ramp(a, b)
+            self.blend_color(iter_material_value(stroke, self.func, self.attribute))
 
 
 class AlphaMaterialShader(CurveMappingModifier):
@@ -480,10 +541,7 @@ class AlphaMaterialShader(CurveMappingModifier):
         self.func = CurveMaterialF0D()
 
     def shade(self, stroke):
-        for svert, value in iter_material_value(stroke, self.func, self.attribute):
-            a = svert.attribute.alpha
-            b = self.evaluate(value)
-            svert.attribute.alpha = self.blend(a, b)
+        self.blend_alpha(iter_material_value(stroke, self.func, self.attribute))
 
 
 class ThicknessMaterialShader(ThicknessBlenderMixIn, CurveMappingModifier):
@@ -533,22 +591,14 @@ class TangentColorShader(ColorRampModifier):
     """Color based on the direction of the stroke"""
     def shade(self, stroke):
         it = Interface0DIterator(stroke)
-        for svert in it:
-            angle = angle_x_normal(it)
-            fac = self.evaluate(angle / pi)
-            a = svert.attribute.color
-            svert.attribute.color = self.blend_ramp(a, fac)
+        self.blend_color((svert, angle_x_normal(it) / pi) for svert in it)
 
 
 class TangentAlphaShader(CurveMappingModifier):
     """Alpha transparency based on the direction of the stroke"""
     def shade(self, stroke):
         it = Interface0DIterator(stroke)
-        for svert in it:
-            angle = angle_x_normal(it)
-            fac = self.evaluate(angle / pi)
-            a = svert.attribute.alpha
-            svert.attribute.alpha = self.blend(a, fac)
+        self.blend_alpha((svert, angle_x_normal(it) / pi) for svert in it)
 
 
 class TangentThicknessShader(ThicknessBlenderMixIn, CurveMappingModifier):
@@ -610,9 +660,10 @@ class ColorNoiseShader(ColorRampModifier, NoiseShader):
         NoiseShader.__init__(self, amplitude, period, seed)
 
     def shade(self, stroke):
-        for svert, noiseval1, noiseval2 in self.noisegen(stroke):
-            position = abs(noiseval1 + noiseval2)
-            svert.attribute.color = self.blend_ramp(svert.attribute.color, self.evaluate(position))
+        self.blend_color(
+            (svert, abs(noiseval1 + noiseval2))
+            for svert, noiseval1, noiseval2 in self.noisegen(stroke)
+        )
 
 
 class AlphaNoiseShader(CurveMappingModifier, NoiseShader):
@@ -622,9 +673,10 @@ class AlphaNoiseShader(CurveMappingModifier, NoiseShader):
         NoiseShader.__init__(self, amplitude, period, seed)
 
     def shade(self, stroke, n1=Noise(), n2=Noise()):
-        for svert, noiseval1, noiseval2 in self.noisegen(stroke):
-            position = abs(noiseval1 + noiseval2)
-            svert.attribute.alpha = self.blend(svert.attribute.alpha, self.evaluate(position))
+        self.blend_alpha(
+            (svert, abs(noiseval1 + noiseval2))
+            for svert, noiseval1, noiseval2 in self.noisegen(stroke)
+        )
 
 
 # - Crease Angle Modifiers - #
@@ -647,12 +699,11 @@ class CreaseAngleColorShader(ColorRampModifier):
         self.angle = BoundedProperty(angle_min, angle_max)
 
     def shade(self, stroke):
-        for svert in stroke:
-            angle = crease_angle(svert)
-            if angle is None:
-                continue
-            t = self.angle.interpolate(angle)
-            svert.attribute.color = self.blend_ramp(svert.attribute.color, self.evaluate(t))
+        self.blend_color(
+            (svert, self.angle.interpolate(angle))
+            for svert, angle in zip(stroke, map(crease_angle, stroke))
+            if angle is not None
+        )
 
 
 class CreaseAngleAlphaShader(CurveMappingModifier):
@@ -663,12 +714,11 @@ class CreaseAngleAlphaShader(CurveMappingModifier):
         self.angle = BoundedProperty(angle_min, angle_max)
 
     def shade(self, stroke):
-        for svert in stroke:
-            angle = crease_angle(svert)
-            if angle is None:
-                continue
-            t = self.angle.interpolate(angle)
-            svert.attribute.alpha = self.blend(svert.attribute.alpha, self.evaluate(t))
+        self.blend_alpha(
+            (svert, self.angle.interpolate(angle))
+            for svert, angle in zip(stroke, map(crease_angle, stroke))
+            if angle is not None
+        )
 
 
 class CreaseAngleThicknessShader(ThicknessBlenderMixIn, CurveMappingModifier):
@@ -714,11 +764,10 @@ class Curvature3DColorShader(ColorRampModifier):
         self.curvature = BoundedProperty(curvature_min, curvature_max)
 
     def shade(self, stroke):
-        for svert in stroke:
-            t = normalized_absolute_curvature(svert, self.curvature)
-            a = svert.attribute.color
-            b = self.evaluate(t)
-            svert.attribute.color = self.blend_ramp(a, b)
+        self.blend_color(
+            (svert, normalized_absolute_curvature(svert, self.curvature))
+            for svert in stroke
+        )
 
 
 class Curvature3DAlphaShader(CurveMappingModifier):
@@ -728,11 +777,10 @@ class Curvature3DAlphaShader(CurveMappingModifier):
         self.curvature = BoundedProperty(curvature_min, curvature_max)
 
     def shade(self, stroke):
-        for svert in stroke:
-            t = normalized_absolute_curvature(svert, self.curvature)
-            a = svert.attribute.alpha
-            b = self.evaluate(t)
-            svert.attribute.alpha = self.blend(a, b)
+        self.blend_alpha(
+            (svert, normalized_absolute_curvature(svert, self.curvature))
+            for svert in stroke
+        )
 
 
 class Curvature3DThicknessShader(ThicknessBlenderMixIn, CurveMappingModifier):
@@ -761,8 +809,9 @@ class SimplificationShader(StrokeShader):
         self.tolerance = tolerance
 
     def shade(self, stroke):
-        points = tuple(svert.point for svert in stroke)
-        points_simplified = simplify(points, tolerance=self.tolerance)
+        xs, ys = stroke_points_xy(stroke)
+        mask = simplify_mask(xs, ys, self.tolerance * self.tolerance)
+        points_simplified = tuple(compress(zip(xs, ys), mask))
 
         it = iter(stroke)
         for svert, point in zip(it, points_simplified):
@@ -914,6 +963,44 @@ class QuantitativeInvisibilityRangeUP1D(UnaryPredicate1D):
         return self.qi_start <= qi <= self.qi_end
 
 
+class EdgeTypesUP1D(UnaryPredicate1D):
+    """
+    The edge type criteria of a line set combined in one predicate,
+    edge types are tested as bit-masks of one CurveNatureF1D evaluation
+    and contours with the given predicates.
+    """
+    def __init__(self, nature_include, nature_exclude,
+                 predicates_include, predicates_exclude, use_or, negate):
+        UnaryPredicate1D.__init__(self)
+        self.nature_include = nature_include
+        self.nature_exclude = nature_exclude
+        self.predicates_include = tuple(predicates_include)
+        self.predicates_exclude = tuple(predicates_exclude)
+        self.use_or = use_or
+        self.negate = negate
+        self.getNature = CurveNatureF1D()
+
+    def __call__(self, inter):
+        nature = self.getNature(inter)
+        nature_include = self.nature_include
+        nature_exclude = self.nature_exclude
+        if self.use_or:
+            result = (
+                bool(nature & nature_include) or
+                (nature & nature_exclude) != nature_exclude or
+                any(pred(inter) for pred in self.predicates_include) or
+                not all(pred(inter) for pred in self.predicates_exclude)
+            )
+        else:
+            result = (
+                (nature & nature_include) == nature_include and
+                not (nature & nature_exclude) and
+                all(pred(inter) for pred in self.predicates_include) and
+                not any(pred(inter) for pred in self.predicates_exclude)
+            )
+        return result != self.negate
+
+
 def getQualifiedObjectName(ob):
     if ob.library is not None:
         return ob.library.filepath + '/' + ob.name
@@ -1228,36 +1315,42 @@ def process(layer_name, lineset_name):
                 QuantitativeInvisibilityRangeUP1D(lineset.qi_start, lineset.qi_end))
     # prepare selection criteria by edge types
     if lineset.select_by_edge_types:
-        edge_type_criteria = []
-        if lineset.select_silhouette:
-            upred = pyNatureUP1D(Nature.SILHOUETTE)
-            edge_type_criteria.append(NotUP1D(upred) if lineset.exclude_silhouette else upred)
-        if lineset.select_border:
-            upred = pyNatureUP1D(Nature.BORDER)
-            edge_type_criteria.append(NotUP1D(upred) if lineset.exclude_border else upred)
-        if lineset.select_crease:
-            upred = pyNatureUP1D(Nature.CREASE)
-            edge_type_criteria.append(NotUP1D(upred) if lineset.exclude_crease else upred)
-        if lineset.select_ridge_valley:
-            upred = pyNatureUP1D(Nature.RIDGE)
-            edge_type_criteria.append(NotUP1D(upred) if lineset.exclude_ridge_valley else upred)
-        if lineset.select_suggestive_contour:
-            upred = pyNatureUP1D(Nature.SUGGESTIVE_CONTOUR)
-            edge_type_criteria.append(NotUP1D(upred) if lineset.exclude_suggestive_contour else upred)
-        if lineset.select_material_boundary:
-            upred = pyNatureUP1D(Nature.MATERIAL_BOUNDARY)
-            edge_type_criteria.append(NotUP1D(upred) if lineset.exclude_material_boundary else upred)
-        if lineset.select_edge_mark:
-            upred = pyNatureUP1D(Nature.EDGE_MARK)
-            edge_type_criteria.append(NotUP1D(upred) if lineset.exclude_edge_mark else upred)
+        nature_include = nature_exclude = 0
+        for edge_type, nature in (
+                ('silhouette', Nature.SILHOUETTE),
+                ('border', Nature.BORDER),
+                ('crease', Nature.CREASE),
+                ('ridge_valley', Nature.RIDGE),
+                ('suggestive_contour', Nature.SUGGESTIVE_CONTOUR),
+                ('material_boundary', Nature.MATERIAL_BOUNDARY),
+                ('edge_mark', Nature.EDGE_MARK),
+                ):
+            if getattr(lineset, "select_" + edge_type):
+                if getattr(lineset, "exclude_" + edge_type):
+                    nature_exclude |= nature
+                else:
+                    nature_include |= nature
+        predicates_include = []
+        predicates_exclude = []
         if lineset.select_contour:
-            upred = ContourUP1D()
-            edge_type_criteria.append(NotUP1D(upred) if lineset.exclude_contour else upred)
+            (predicates_exclude if lineset.exclude_contour else predicates_include).append(
+                ContourUP1D())
         if lineset.select_external_contour:
-            upred = ExternalContourUP1D()
-            edge_type_criteria.append(NotUP1D(upred) if lineset.exclude_external_contour else upred)
-        if edge_type_criteria:
-            if lineset.edge_type_combination == 'OR':
+            (predicates_exclude if lineset.exclude_external_contour else predicates_include).append(
+                ExternalContourUP1D())
+        if nature_include or nature_exclude:
+            # one nature evaluation for all edge types, instead of a predicate each
+            selection_criteria.append(EdgeTypesUP1D(
+                nature_include, nature_exclude,
+                predicates_include, predicates_exclude,
+                lineset.edge_type_combination == 'OR',
+                lineset.edge_type_negation == 'EXCLUSIVE',
+                ))
+        elif predicates_include or predicates_exclude:
+            edge_type_criteria = predicates_include + [NotUP1D(upred) for upred in predicates_exclude]
+            if len(edge_type_criteria) == 1:
+                upred = edge_type_criteria[0]
+            elif lineset.edge_type_combination == 'OR':
                 upred = OrUP1D(*edge_type_criteria)
             else:
                 upred = AndUP1D(*edge_type_criteria)
@@ -1285,7 +1378,10 @@ def process(layer_name, lineset_name):
         upred = WithinImageBoundaryUP1D(*ContextFunctions.get_border())
         selection_criteria.append(upred)
     # select feature edges
-    if selection_criteria:
+    if len(selection_criteria) == 1:
+        # avoid the AndUP1D call, a single native predicate stays native
+        upred = selection_criteria[0]
+    elif selection_criteria:
         upred = AndUP1D(*selection_criteria)
     else:
         upred = TrueUP1D()
@@ -1413,6 +1509,8 @@ def process(layer_name, lineset_name):
         if bpy.app.debug_freestyle:
             print("Warning: Thickness position options are applied when chaining is disabled\n"
                   "         or the Plain chaining is used with the Same Object option enabled.")
+    # share vertex attributes between the modifiers below (the geometry doesn't change).
+    shaders_list.append(StrokeAttributeCacheShader())
     shaders_list.append(ConstantColorShader(*(linestyle.color), alpha=linestyle.alpha))
     shaders_list.append(BaseThicknessShader(linestyle.thickness, thickness_position,
                                             linestyle.thickness_ratio))
@@ -1536,6 +1634,7 @@ def process(layer_name, lineset_name):
                 m.curvature_min, m.curvature_max, m.thickness_min, m.thickness_max))
         else:
             raise RuntimeError("No Thickness modifier with type", type(m), m)
+    shaders_list.append(StrokeAttributeCacheShader(clear=True))
     # -- Textures -- #
     has_tex = False
     if linestyle.use_nodes and linestyle.node_tree:
@@ -27,6 +27,8 @@ __all__ = (
     "disable_all",
     "reset_all",
     "module_bl_info",
+    "bl_info_cache_clear",
+    "bl_info_cache_stats",
 )
 
 import bpy as _bpy
@@ -58,7 +60,180 @@ def paths():
     return addon_paths
 
 
-def modules_refresh(module_cache=addons_fake_modules):
+class _BlInfoCache:
+    """
+    Persistent cache of parsed ``bl_info``, keyed by the add-on path,
+    so add-ons which haven't changed on disk don't need to be read & parsed.
+    """
+    __slots__ = (
+        "entries",
+        "is_loaded",
+        "is_dirty",
+        "hits",
+        "misses",
+        "_lock",
+    )
+
+    # Increment when the format changes, the Python version is included
+    # since marshal data isn't portable between versions.
+    _version = 1
+    _filename = "addons_bl_info.cache"
+
+    def __init__(self):
+        # {mod_path: (mtime, size, bl_info_marshal)}
+        self.entries = {}
+        self.is_loaded = False
+        self.is_dirty = False
+        self.hits = 0
+        self.misses = 0
+        # Add-ons may be scanned from multiple threads.
+        from threading import Lock
+        self._lock = Lock()
+
+    def _header(self):
+        import sys
+        return (self._version, tuple(sys.version_info[:2]))
+
+    @classmethod
+    def _filepath(cls, create=False):
+        import os
+        path = _bpy.utils.user_resource('CONFIG', create=create)
+        if not path:
+            return ""
+        return os.path.join(path, cls._filename)
+
+    def load(self):
+        if self.is_loaded:
+            return
+        self.is_loaded = True
+
+        import marshal
+        filepath = self._filepath()
+        if not filepath:
+            return
+        try:
+            with open(filepath, "rb") as fh:
+                header, entries = marshal.load(fh)
+        except FileNotFoundError:
+            return
+        except Exception as ex:
+            print("Error reading add-on cache:", repr(filepath), ex)
+            return
+
+        if header == self._header() and type(entries) is dict:
+            self.entries = entries
+
+    def save(self):
+        if not self.is_dirty:
+            return
+        self.is_dirty = False
+
+        import os
+        import marshal
+        filepath = self._filepath(create=True)
+        if not filepath:
+            return
+        # Write to a temporary file first so the cache is never left
+        # half written (other Blender instances may be reading it).
+        filepath_tmp = filepath + "@" + str(os.getpid())
+        try:
+            with open(filepath_tmp, "wb") as fh:
+                marshal.dump((self._header(), self.entries), fh)
+            os.replace(filepath_tmp, filepath)
+        except Exception as ex:
+            print("Error writing add-on cache:", repr(filepath), ex)
+            try:
+                os.remove(filepath_tmp)
+            except OSError:
+                pass
+
+    def get(self, mod_path, mod_stat):
+        """
+        Return a new ``bl_info`` dict or None when the file has changed.
+        """
+        import marshal
+        with self._lock:
+            entry = self.entries.get(mod_path)
+            if (
+                    entry is not None and
+                    entry[0] == mod_stat.st_mtime and
+                    entry[1] == mod_stat.st_size
+            ):
+                self.hits += 1
+            else:
+                self.misses += 1
+                return None
+        # Unpack every time since callers may modify 'bl_info'.
+        return marshal.loads(entry[2])
+
+    def set(self, mod_path, mod_stat, bl_info):
+        import marshal
+        try:
+            bl_info_marshal = marshal.dumps(bl_info)
+        except ValueError:
+            # Literals marshal can't store, don't cache.
+            return
+        with self._lock:
+            self.entries[mod_path] = (
+                mod_stat.st_mtime,
+                mod_stat.st_size,
+                bl_info_marshal,
+            )
+            self.is_dirty = True
+
+    def prune(self, mod_paths):
+        # Remove add-ons which no longer exist.
+        for mod_path in (self.entries.keys() - mod_paths):
+            del self.entries[mod_path]
+            self.is_dirty = True
+
+    def clear(self, mod_path=None):
+        self.load()
+        if mod_path is None:
+            if self.entries:
+                self.entries.clear()
+                self.is_dirty = True
+        elif self.entries.pop(mod_path, None) is not None:
+            self.is_dirty = True
+        self.save()
+
+
+_bl_info_cache = _BlInfoCache()
+
+
+def bl_info_cache_clear(mod_path=None):
+    """
+    Invalidate the cached ``bl_info`` of add-ons,
+    so they are read from disk on the next refresh.
+
+    :arg mod_path: The add-on file to invalidate or None for all add-ons.
+    :type mod_path: string
+    """
+    _bl_info_cache.clear(mod_path)
+
+
+def bl_info_cache_stats():
+    """
+    Return statistics for the ``bl_info`` cache (since Blender started).
+
+    :return: dict with "hits", "misses" & "entries" keys.
+    :rtype: dict
+    """
+    return {
+        "hits": _bl_info_cache.hits,
+        "misses": _bl_info_cache.misses,
+        "entries": len(_bl_info_cache.entries),
+    }
+
+
+def modules_refresh(module_cache=addons_fake_modules, *, use_threads=False):
+    """
+    Update the add-on modules cache, reading ``bl_info`` of new add-ons.
+
+    :arg use_threads: Scan add-on paths & read files using a thread-pool,
+       useful when add-ons are stored on high latency file-systems.
+    :type use_threads: bool
+    """
     global error_encoding
     import os
 
@@ -75,6 +250,23 @@ def modules_refresh(module_cache=addons_fake_modules):
             print("fake_module", mod_path, mod_name)
         import ast
         ModuleType = type(ast)
+
+        try:
+            mod_stat = os.stat(mod_path)
+        except OSError as ex:
+            print("Error opening file:", mod_path, ex)
+            return None
+
+        bl_info = _bl_info_cache.get(mod_path, mod_stat)
+        if bl_info is not None:
+            mod = ModuleType(mod_name)
+            mod.bl_info = bl_info
+            mod.__file__ = mod_path
+            mod.__time__ = mod_stat.st_mtime
+            if force_support is not None:
+                mod.bl_info["support"] = force_support
+            return mod
+
         try:
             file_mod = open(mod_path, "r", encoding='UTF-8')
         except OSError as ex:
@@ -136,13 +328,16 @@ def modules_refresh(module_cache=addons_fake_modules):
                 mod = ModuleType(mod_name)
                 mod.bl_info = ast.literal_eval(body.value)
                 mod.__file__ = mod_path
-                mod.__time__ = os.path.getmtime(mod_path)
+                mod.__time__ = mod_stat.st_mtime
             except:
                 print("AST error parsing bl_info for:", mod_name)
                 import traceback
                 traceback.print_exc()
                 raise
 
+            # Cache before 'force_support' is applied, it depends on the path.
+            _bl_info_cache.set(mod_path, mod_stat, mod.bl_info)
+
             if force_support is not None:
                 mod.bl_info["support"] = force_support
 
@@ -156,17 +351,60 @@ def modules_refresh(module_cache=addons_fake_modules):
             return None
 
     modules_stale = set(module_cache.keys())
+    mod_paths = set()
 
-    for path in path_list:
+    _bl_info_cache.load()
 
+    def path_force_support(path):
         # force all contrib addons to be 'TESTING'
         if path.endswith(("addons_contrib", )):
-            force_support = 'TESTING'
-        else:
-            force_support = None
+            return 'TESTING'
+        return None
+
+    if use_threads:
+        # Overlap directory listing and file reading (which may be slow
+        # on network file-systems), results are still handled in order below
+        # so duplicate detection is the same as a serial scan.
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor()
+        path_module_names = list(executor.map(_bpy.path.module_names, path_list))
+
+        # {mod_path: future} for the first add-on found with each name.
+        mod_futures = {}
+        mod_names_found = set()
+        for path, mod_names in zip(path_list, path_module_names):
+            force_support = path_force_support(path)
+            for mod_name, mod_path in mod_names:
+                if mod_name in mod_names_found:
+                    continue
+                mod_names_found.add(mod_name)
+                mod = module_cache.get(mod_name)
+                if mod is None:
+                    mod_futures[mod_path] = executor.submit(
+                        fake_module,
+                        mod_name,
+                        mod_path,
+                        force_support=force_support,
+                    )
+                elif mod.__file__ == mod_path:
+                    mod_futures[mod_path] = executor.submit(
+                        os.path.getmtime,
+                        mod_path,
+                    )
+        del mod_names_found
+        executor.shutdown(wait=True)
+        del executor
+    else:
+        path_module_names = map(_bpy.path.module_names, path_list)
+        mod_futures = {}
 
-        for mod_name, mod_path in _bpy.path.module_names(path):
+    for path, mod_names in zip(path_list, path_module_names):
+        force_support = path_force_support(path)
+
+        for mod_name, mod_path in mod_names:
             modules_stale.discard(mod_name)
+            mod_paths.add(mod_path)
+            mod_future = mod_futures.pop(mod_path, None)
             mod = module_cache.get(mod_name)
             if mod:
                 if mod.__file__ != mod_path:
@@ -176,24 +414,34 @@ def modules_refresh(module_cache=addons_fake_modules):
                         "  " f"{mod_path!r}"
                     )
                     error_duplicates.append((mod.bl_info["name"], mod.__file__, mod_path))
+                    continue
+
+                if mod_future is not None:
+                    mod_time = mod_future.result()
+                    mod_future = None
+                else:
+                    mod_time = os.path.getmtime(mod_path)
 
-                elif mod.__time__ != os.path.getmtime(mod_path):
+                if mod.__time__ != mod_time:
                     print(
                         "reloading addon:",
                         mod_name,
                         mod.__time__,
-                        os.path.getmtime(mod_path),
+                        mod_time,
                         repr(mod_path),
                     )
                     del module_cache[mod_name]
                     mod = None
 
             if mod is None:
-                mod = fake_module(
-                    mod_name,
-                    mod_path,
-                    force_support=force_support,
-                )
+                if mod_future is not None:
+                    mod = mod_future.result()
+                else:
+                    mod = fake_module(
+                        mod_name,
+                        mod_path,
+                        force_support=force_support,
+                    )
                 if mod:
                     module_cache[mod_name] = mod
 
@@ -202,10 +450,13 @@ def modules_refresh(module_cache=addons_fake_modules):
         del module_cache[mod_stale]
     del modules_stale
 
+    _bl_info_cache.prune(mod_paths)
+    _bl_info_cache.save()
+
 
-def modules(module_cache=addons_fake_modules, *, refresh=True):
+def modules(module_cache=addons_fake_modules, *, refresh=True, use_threads=False):
     if refresh or ((module_cache is addons_fake_modules) and modules._is_first):
-        modules_refresh(module_cache)
+        modules_refresh(module_cache, use_threads=use_threads)
         modules._is_first = False
 
     mod_list = list(module_cache.values())
@@ -347,10 +598,15 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
     with RestrictBlend():
 
         # 1) try import
+        # Re-enabling doesn't import again, keep the first import's profile.
+        use_profile = module_name not in sys.modules
+        profile = _bpy.utils._script_profile_begin()
         try:
             mod = __import__(module_name)
             mod.__time__ = os.path.getmtime(mod.__file__)
             mod.__addon_enabled__ = False
+            if use_profile:
+                _bpy.utils._script_profile_end('ADDON', module_name, "import", profile)
         except Exception as ex:
             # if the addon doesn't exist, don't print full traceback
             if type(ex) is ImportError and ex.name == module_name:
@@ -373,13 +629,20 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
         # 2) Try register collected modules.
         # Removed register_module, addons need to handle their own registration now.
 
+        # Add-ons may extend built-in interface classes, ensure any deferred
+        # by lazy loading are registered unless the add-on doesn't use them.
+        if not mod.bl_info.get("lazy_ui", False):
+            _bpy.utils.register_ui_deferred()
+
         from _bpy import _bl_owner_id_get, _bl_owner_id_set
         owner_id_prev = _bl_owner_id_get()
         _bl_owner_id_set(module_name)
 
         # 3) Try run the modules register function.
+        profile = _bpy.utils._script_profile_begin()
         try:
             mod.register()
+            _bpy.utils._script_profile_end('ADDON', module_name, "register", profile)
         except Exception as ex:
             print(
                 "Exception in module register():",
@@ -25,6 +25,8 @@
 import collections
 import copy
 import datetime
+import functools
+import itertools
 import os
 import re
 import sys
@@ -41,6 +43,71 @@ ignore_reg = re.compile(r"^(?:[-*.()/\\+%°0-9]|%d|%f|%s|%r|\s)*$")
 filter_message = ignore_reg.match
 
 
+class ExtractCache:
+    """
+    Messages extracted from source files, stored (in settings.EXTRACT_CACHE, if set) between two extractions.
+    The cache is a pickle file, loading it can run arbitrary code: it must not be writable by other users.
+    Entries are stored per kind of source ('PY', 'SRC') and file path, and are only valid if both the hash of the
+    file content and the hash of the extraction parameters (keywords, contexts...) did not change.
+    """
+    VERSION = 1
+
+    def __init__(self, settings, kind, params):
+        import hashlib
+        self.settings = settings
+        self.kind = kind
+        self.hash_algo = settings.PARSER_CACHE_HASH
+        self.params_hash = hashlib.new(self.hash_algo, repr((self.VERSION, params)).encode()).digest()
+        self.data = {}
+        self.is_dirty = False
+        cache = settings.EXTRACT_CACHE
+        if cache and os.path.exists(cache):
+            import pickle
+            try:
+                with open(cache, 'rb') as f:
+                    self.data = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError) as e:
+                print("WARNING: could not read extraction cache {} ({}), ignoring it.".format(cache, str(e)))
+
+    def content_hash(self, path):
+        import hashlib
+        with open(path, 'rb') as f:
+            return hashlib.new(self.hash_algo, f.read()).digest()
+
+    def get(self, path, content_hash):
+        cached = self.data.get(self.kind, {}).get(path)
+        if cached and cached[0] == content_hash and cached[1] == self.params_hash:
+            return cached[2]
+        return None
+
+    def set(self, path, content_hash, entries):
+        self.data.setdefault(self.kind, {})[path] = (content_hash, self.params_hash, entries)
+        self.is_dirty = True
+
+    def save(self):
+        cache = self.settings.EXTRACT_CACHE
+        if not (cache and self.is_dirty):
+            return
+        import pickle
+        import tempfile
+        # Write in a (uniquely named) temp file of the same dir first, so that an interrupted or concurrent
+        # extraction never leaves a broken cache.
+        cache_dir = os.path.dirname(os.path.abspath(cache))
+        cache_tmp = None
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with tempfile.NamedTemporaryFile('wb', dir=cache_dir, prefix=os.path.basename(cache), suffix=".tmp",
+                                             delete=False) as f:
+                cache_tmp = f.name
+                pickle.dump(self.data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(cache_tmp, cache)
+        except OSError as e:
+            print("WARNING: could not write extraction cache {} ({}), ignoring it.".format(cache, str(e)))
+            if cache_tmp and os.path.exists(cache_tmp):
+                os.remove(cache_tmp)
+        self.is_dirty = False
+
+
 def init_spell_check(settings, lang="en_US"):
     try:
         from bl_i18n_utils import utils_spell_check
@@ -524,6 +591,12 @@ def dump_py_messages_from_files(msgs, reports, files, settings):
         opname, _ = bag[0]
         if not opname:
             return i18n_contexts.default
+        # The operator's context is only resolved when processing the message (see _op_ctxt_resolve),
+        # so that extracted messages do not depend on current operators and can be cached.
+        return (opname,)
+
+    @functools.lru_cache(maxsize=None)
+    def _op_ctxt_resolve(opname):
         op = bpy.ops
         for n in opname.split('.'):
             op = getattr(op, n)
@@ -623,12 +696,15 @@ def dump_py_messages_from_files(msgs, reports, files, settings):
             "spell_errors": check_ctxt.get("spell_errors"),
         }
 
-    for fp in files:
+    def extract_file(fp):
+        """
+        Return a list of (msgctxt, msgid, line) entries, msgctxt being an (opname,) tuple when it is the context
+        of an operator, line being None when unknown.
+        """
+        entries = []
         with open(fp, 'r', encoding="utf8") as filedata:
             root_node = ast.parse(filedata.read(), fp, 'exec')
 
-        fp_rel = make_rel(fp)
-
         for node in ast.walk(root_node):
             if type(node) == ast.Call:
                 # print("found function at")
@@ -683,12 +759,29 @@ def dump_py_messages_from_files(msgs, reports, files, settings):
                         #print(estr, nds)
                     for estr, nds in estr_lst:
                         if estr:
-                            if nds:
-                                msgsrc = "{}:{}".format(fp_rel, sorted({nd.lineno for nd in nds})[0])
-                            else:
-                                msgsrc = "{}:???".format(fp_rel)
-                            process_msg(msgs, msgctxt, estr, msgsrc, reports, check_ctxt_py, settings)
-                            reports["py_messages"].append((msgctxt, estr, msgsrc))
+                            line = min(nd.lineno for nd in nds) if nds else None
+                            entries.append((msgctxt, estr, line))
+        return entries
+
+    # Extracted messages only depend on the file content and on the functions/contexts definitions.
+    cache = ExtractCache(settings, 'PY', (sorted(func_translate_args.items()),
+                                          sorted((n, getattr(i18n_contexts, n)) for n in i18n_ctxt_ids),
+                                          i18n_contexts.default))
+    for fp in files:
+        content_hash = cache.content_hash(fp)
+        entries = cache.get(fp, content_hash)
+        if entries is None:
+            entries = extract_file(fp)
+            cache.set(fp, content_hash, entries)
+
+        fp_rel = make_rel(fp)
+        for msgctxt, estr, line in entries:
+            if isinstance(msgctxt, tuple):
+                msgctxt = _op_ctxt_resolve(*msgctxt)
+            msgsrc = "{}:{}".format(fp_rel, "???" if line is None else line)
+            process_msg(msgs, msgctxt, estr, msgsrc, reports, check_ctxt_py, settings)
+            reports["py_messages"].append((msgctxt, estr, msgsrc))
+    cache.save()
 
 
 def dump_py_messages(msgs, reports, addons, settings, addons_only=False):
@@ -718,6 +811,41 @@ def dump_py_messages(msgs, reports, addons, settings, addons_only=False):
 
 
 ##### C source code #####
+def _extract_src_file(data):
+    """
+    Extract raw messages from a C source file, as a list of (line, msg_raw, (ctxt_raw, ...)) items.
+    Does not depend on bpy, so that it can run in worker processes (and its result can be cached).
+    """
+    path, (keywords, max_multi_ctxt) = data
+    # Build regexes to extract messages (with optional contexts) from C source.
+    pygettexts = tuple(re.compile(r).search for r in keywords)
+
+    entries = []
+    data = ""
+    with open(path) as f:
+        data = f.read()
+    for srch in pygettexts:
+        m = srch(data)
+        line = pos = 0
+        while m:
+            d = m.groupdict()
+            # Line.
+            line += data[pos:m.start()].count('\n')
+            _msgid = d.get("msg_raw")
+            # First, try the "multi-contexts" stuff!
+            _msgctxts = tuple(d.get("ctxt_raw{}".format(i)) for i in range(max_multi_ctxt))
+            if _msgctxts[0]:
+                _msgctxts = tuple(itertools.takewhile(bool, _msgctxts))
+            else:
+                _msgctxts = (d.get("ctxt_raw"),)
+            entries.append((line, _msgid, _msgctxts))
+
+            pos = m.end()
+            line += data[m.start():pos].count('\n')
+            m = srch(data, pos)
+    return entries
+
+
 def dump_src_messages(msgs, reports, settings):
     def get_contexts():
         """Return a mapping {C_CTXT_NAME: ctxt_value}."""
@@ -725,15 +853,12 @@ def dump_src_messages(msgs, reports, settings):
 
     contexts = get_contexts()
 
-    # Build regexes to extract messages (with optional contexts) from C source.
-    pygettexts = tuple(re.compile(r).search for r in settings.PYGETTEXT_KEYWORDS)
-
     _clean_str = re.compile(settings.str_clean_re).finditer
 
     def clean_str(s):
         return "".join(m.group("clean") for m in _clean_str(s))
 
-    def dump_src_file(path, rel_path, msgs, reports, settings):
+    def dump_src_file(entries, rel_path, msgs, reports, settings):
         def process_entry(_msgctxt, _msgid):
             # Context.
             msgctxt = settings.DEFAULT_CONTEXT
@@ -764,36 +889,12 @@ def dump_src_messages(msgs, reports, settings):
                 "spell_errors": check_ctxt.get("spell_errors"),
             }
 
-        data = ""
-        with open(path) as f:
-            data = f.read()
-        for srch in pygettexts:
-            m = srch(data)
-            line = pos = 0
-            while m:
-                d = m.groupdict()
-                # Line.
-                line += data[pos:m.start()].count('\n')
-                msgsrc = rel_path + ":" + str(line)
-                _msgid = d.get("msg_raw")
-                # First, try the "multi-contexts" stuff!
-                _msgctxts = tuple(d.get("ctxt_raw{}".format(i)) for i in range(settings.PYGETTEXT_MAX_MULTI_CTXT))
-                if _msgctxts[0]:
-                    for _msgctxt in _msgctxts:
-                        if not _msgctxt:
-                            break
-                        msgctxt, msgid = process_entry(_msgctxt, _msgid)
-                        process_msg(msgs, msgctxt, msgid, msgsrc, reports, check_ctxt_src, settings)
-                        reports["src_messages"].append((msgctxt, msgid, msgsrc))
-                else:
-                    _msgctxt = d.get("ctxt_raw")
-                    msgctxt, msgid = process_entry(_msgctxt, _msgid)
-                    process_msg(msgs, msgctxt, msgid, msgsrc, reports, check_ctxt_src, settings)
-                    reports["src_messages"].append((msgctxt, msgid, msgsrc))
-
-                pos = m.end()
-                line += data[m.start():pos].count('\n')
-                m = srch(data, pos)
+        for line, _msgid, _msgctxts in entries:
+            msgsrc = rel_path + ":" + str(line)
+            for _msgctxt in _msgctxts:
+                msgctxt, msgid = process_entry(_msgctxt, _msgid)
+                process_msg(msgs, msgctxt, msgid, msgsrc, reports, check_ctxt_src, settings)
+                reports["src_messages"].append((msgctxt, msgid, msgsrc))
 
     forbidden = set()
     forced = set()
@@ -819,10 +920,36 @@ def dump_src_messages(msgs, reports, settings):
                 continue
             elif rel_path not in forced:
                 forced.add(rel_path)
+
+    # Raw messages are extracted from files in parallel, and cached, only messages processing is sequential.
+    extract_params = (settings.PYGETTEXT_KEYWORDS, settings.PYGETTEXT_MAX_MULTI_CTXT)
+    cache = ExtractCache(settings, 'SRC', extract_params)
+    src_files = []
+    src_entries = {}
     for rel_path in sorted(forced):
         path = os.path.join(settings.SOURCE_DIR, rel_path)
         if os.path.exists(path):
-            dump_src_file(path, rel_path, msgs, reports, settings)
+            content_hash = cache.content_hash(path)
+            entries = cache.get(path, content_hash)
+            if entries is None:
+                src_files.append((path, content_hash))
+            else:
+                src_entries[path] = entries
+    print("Extracting messages from {} C source files ({} cached)...".format(len(src_files) + len(src_entries),
+                                                                            len(src_entries)))
+    if src_files:
+        tasks = tuple((path, extract_params) for path, _content_hash in src_files)
+        chunksize = max(1, len(tasks) // ((os.cpu_count() or 1) * 8))
+        for (path, content_hash), entries in zip(src_files, utils.process_pool_map(_extract_src_file, tasks,
+                                                                                   chunksize=chunksize)):
+            cache.set(path, content_hash, entries)
+            src_entries[path] = entries
+        cache.save()
+
+    for rel_path in sorted(forced):
+        path = os.path.join(settings.SOURCE_DIR, rel_path)
+        if path in src_entries:
+            dump_src_file(src_entries[path], rel_path, msgs, reports, settings)
 
 
 ##### Main functions! #####
@@ -835,6 +962,9 @@ def dump_messages(do_messages, do_checks, settings):
                                                 settings=settings)
     msgs = pot.msgs
 
+    # Messages are extracted from the whole interface, which may be deferred.
+    bpy.utils.register_ui_deferred()
+
     # Enable all wanted addons.
     # For now, enable all official addons, before extracting msgids.
     addons = utils.enable_addons(support={"OFFICIAL"})
@@ -506,6 +506,12 @@ SRC_POTFILES = ""
 # A cache storing validated msgids, to avoid re-spellchecking them.
 SPELL_CACHE = os.path.join("/tmp", ".spell_cache")
 
+# A cache storing messages extracted from each py/C source file (keyed by its content hash), to only re-extract
+# modified files. This is a pickle file (loading it can run arbitrary code), so it's stored in the user's config dir
+# and never in a shared place like /tmp. None disables it.
+_USER_CONFIG_DIR = bpy.utils.user_resource('CONFIG')
+EXTRACT_CACHE = os.path.join(_USER_CONFIG_DIR, "i18n_extract_cache.pickle") if _USER_CONFIG_DIR else None
+
 # Threshold defining whether a new msgid is similar enough with an old one to reuse its translation...
 SIMILAR_MSGID_THRESHOLD = 0.75
 
@@ -28,7 +28,6 @@ import os
 import re
 import struct
 import sys
-import tempfile
 #import time
 
 from bl_i18n_utils import (
@@ -50,6 +49,23 @@ def is_valid_po_path(path):
     return bool(_valid_po_path_re.match(path))
 
 
+def process_pool_map(func, tasks, chunksize=1, initializer=None, initargs=()):
+    """
+    Yield the results of func over tasks (in order), computed by worker processes forked from Blender on Linux.
+    Elsewhere, or with a single task, they are computed in this process: spawned workers would have to import
+    these modules, which need bpy. Forking a process with threads is not safe on macOS either.
+    """
+    if sys.platform == "linux" and len(tasks) > 1:
+        import multiprocessing
+        with concurrent.futures.ProcessPoolExecutor(mp_context=multiprocessing.get_context("fork"),
+                                                    initializer=initializer, initargs=initargs) as exctr:
+            yield from exctr.map(func, tasks, chunksize=chunksize)
+    else:
+        if initializer is not None:
+            initializer(*initargs)
+        yield from map(func, tasks)
+
+
 def get_best_similar(data):
     import difflib
     key, use_similar, similar_pool = data
@@ -80,6 +96,184 @@ def get_best_similar(data):
     return key, tmp
 
 
+class SimilarMsgidIndex:
+    """
+    Index of a pool of msgids, giving the same best match as get_best_similar, without running
+    difflib.SequenceMatcher over the whole pool for each key.
+    * msgids are bucketed by length, whole buckets are skipped as soon as their length alone
+      (i.e. real_quick_ratio) cannot beat the current best ratio.
+    * A trigram inverted index gives a shortlist of msgids sharing the most trigrams with the key, which are
+      checked first, so that a good best ratio is found early and most of the remaining msgids get discarded
+      by their length or quick_ratio (computed from pre-computed character counts), before having to compute
+      their real ratio.
+    Ties are solved as in get_best_similar (the last matching msgid of the pool wins).
+    """
+    NGRAM_SIZE = 3
+
+    def __init__(self, msgids):
+        self.msgids = tuple(msgids)
+        self.counts = tuple(tuple(collections.Counter(msgid).items()) for msgid in self.msgids)
+        self.buckets = {}
+        self.ngrams = {}
+        for idx, msgid in enumerate(self.msgids):
+            self.buckets.setdefault(len(msgid), []).append(idx)
+            for ng in self._ngrams(msgid):
+                self.ngrams.setdefault(ng, []).append(idx)
+        self.lengths = tuple(sorted(self.buckets))
+
+    @classmethod
+    def _ngrams(cls, msgid):
+        n = cls.NGRAM_SIZE
+        return {msgid[i:i + n] for i in range(len(msgid) - n + 1)}
+
+    def get_best_similar(self, msgid, use_similar):
+        import difflib
+        from bisect import bisect_right, bisect_left
+
+        # Same length limits as get_best_similar.
+        len_key = len(msgid)
+        min_len = len_key // 2
+        max_len = len_key * 2
+        lengths = self.lengths[bisect_right(self.lengths, min_len):bisect_left(self.lengths, max_len)]
+        if not lengths:
+            return None
+
+        s = difflib.SequenceMatcher()
+        s.set_seq2(msgid)
+
+        best = None
+        best_idx = -1
+        best_ratio = use_similar
+
+        # Shortlist: msgids of valid length sharing some trigrams with the key, most shared ones first.
+        shared = {}
+        valid_lengths = set(lengths)
+        msgids = self.msgids
+        for ng in self._ngrams(msgid):
+            for idx in self.ngrams.get(ng, ()):
+                if len(msgids[idx]) in valid_lengths:
+                    shared[idx] = shared.get(idx, 0) + 1
+        shortlist = sorted(shared, key=lambda idx: (shared[idx], idx), reverse=True)
+
+        # And all the other msgids whose length can still give a better match,
+        # their max possible ratio decreases as their length gets away from the key's one.
+        lengths = sorted(lengths, key=lambda len_x: abs(len_x - len_key))
+        candidates = [shortlist] + [[idx for idx in self.buckets[len_x] if idx not in shared] for len_x in lengths]
+        lengths = [None] + lengths
+
+        key_counts = dict(collections.Counter(msgid))
+        counts = self.counts
+        for len_bucket, indices in zip(lengths, candidates):
+            # Same value as SequenceMatcher.real_quick_ratio(), for the whole length bucket.
+            if len_bucket is not None and 2.0 * min(len_bucket, len_key) / (len_bucket + len_key) < best_ratio:
+                continue
+            for idx in indices:
+                x = msgids[idx]
+                len_x = len(x)
+                # Same value as SequenceMatcher.real_quick_ratio().
+                ratio = 2.0 * min(len_x, len_key) / (len_x + len_key)
+                if ratio < best_ratio or (ratio == best_ratio and idx < best_idx):
+                    continue
+                # Same value as SequenceMatcher.quick_ratio().
+                matches = 0
+                for c, n in counts[idx]:
+                    n_key = key_counts.get(c, 0)
+                    matches += n if n < n_key else n_key
+                ratio = 2.0 * matches / (len_x + len_key)
+                if ratio < best_ratio or (ratio == best_ratio and idx < best_idx):
+                    continue
+                s.set_seq1(x)
+                ratio = s.ratio()
+                if ratio > best_ratio or (ratio == best_ratio and idx > best_idx):
+                    best, best_idx, best_ratio = x, idx, ratio
+        return best
+
+
+# Index shared with the worker processes of I18nMessages.update, set once per worker by _similar_index_init.
+_similar_index = None
+
+
+def _similar_index_init(similar_index):
+    global _similar_index
+    _similar_index = similar_index
+
+
+def _get_best_similar_indexed(data):
+    key, use_similar = data
+    return key, _similar_index.get_best_similar(key[1], use_similar)
+
+
+def _mo_hash_string(key):
+    """The gettext hashpjw hash function, key being utf-8 encoded bytes."""
+    hval = 0
+    for c in key:
+        hval = ((hval << 4) + c) & 0xffffffff
+        g = hval & 0xf0000000
+        if g:
+            hval ^= g >> 24
+            hval ^= g
+    return hval
+
+
+def _mo_hash_size(nbr_msgs):
+    """Size of the mo hash table, the smallest prime number above 4/3 of the number of messages (at least 3)."""
+    size = max(3, (nbr_msgs * 4) // 3) | 1
+    while any(size % d == 0 for d in range(3, int(size ** 0.5) + 1, 2)):
+        size += 2
+    return size
+
+
+def gen_mo_data(msgs):
+    """
+    Generate the binary content of a mo file, msgs being an iterable of (msgid, msgstr) utf-8 encoded bytes, where
+    msgid is prefixed by its context and the EOT char ('\\x04') when it has one.
+    Using http://www.gnu.org/software/gettext/manual/html_node/MO-Files.html notation.
+    """
+    # Original strings must be sorted, gettext falls back to a binary search when the hash table lookup fails.
+    msgs = sorted(msgs)
+    N = len(msgs)
+    S = _mo_hash_size(N)
+    O = 7 * 4
+    T = O + N * 8
+    H = T + N * 8
+
+    # Lengths (without the final NULL char) and offsets of the strings, which are stored after the hash table.
+    offset = H + S * 4
+    msgid_table = []
+    for msgid, _msgstr in msgs:
+        msgid_table += (len(msgid), offset)
+        offset += len(msgid) + 1
+    msgstr_table = []
+    for _msgid, msgstr in msgs:
+        msgstr_table += (len(msgstr), offset)
+        offset += len(msgstr) + 1
+
+    # Same open addressing (double hashing) as gettext, entries are 1-based indices of the strings (0 is void).
+    hash_table = [0] * S
+    for i, (msgid, _msgstr) in enumerate(msgs):
+        hval = _mo_hash_string(msgid)
+        idx = hval % S
+        incr = 1 + (hval % (S - 2))
+        while hash_table[idx]:
+            idx = (idx - (S - incr)) if idx >= S - incr else (idx + incr)
+        hash_table[idx] = i + 1
+
+    return b"".join((
+        struct.pack("<7I", 0x950412de, 0, N, O, T, S, H),
+        struct.pack("<{}I".format(N * 2), *msgid_table),
+        struct.pack("<{}I".format(N * 2), *msgstr_table),
+        struct.pack("<{}I".format(S), *hash_table),
+        b"".join(msgid + b"\0" for msgid, _msgstr in msgs),
+        b"".join(msgstr + b"\0" for _msgid, msgstr in msgs),
+    ))
+
+
+def _write_mo_file(data):
+    dst, msgs = data
+    with open(dst, 'wb') as f:
+        f.write(gen_mo_data(msgs))
+
+
 def locale_match(loc1, loc2):
     """
     Return:
@@ -566,24 +760,30 @@ class I18nMessages:
 
         # Next process new keys.
         if use_similar > 0.0:
-            with concurrent.futures.ProcessPoolExecutor() as exctr:
-                for key, msgid in exctr.map(get_best_similar,
-                                            tuple((nk, use_similar, tuple(similar_pool.keys())) for nk in new_keys)):
-                    if msgid:
-                        # Try to get the same context, else just get one...
-                        skey = (key[0], msgid)
-                        if skey not in similar_pool[msgid]:
-                            skey = tuple(similar_pool[msgid])[0]
-                        # We keep org translation and comments, and mark message as fuzzy.
-                        msg, refmsg = self.msgs[skey].copy(), ref.msgs[key]
-                        msg.msgctxt = refmsg.msgctxt
-                        msg.msgid = refmsg.msgid
-                        msg.sources = refmsg.sources
-                        msg.is_fuzzy = True
-                        msg.is_commented = refmsg.is_commented
-                        msgs[key] = msg
-                    else:
-                        msgs[key] = ref.msgs[key]
+            # The index is only sent once to each worker, not with each task.
+            similar_index = SimilarMsgidIndex(similar_pool.keys())
+            tasks = tuple((nk, use_similar) for nk in new_keys)
+            chunksize = max(1, len(tasks) // ((os.cpu_count() or 1) * 8))
+            results = process_pool_map(_get_best_similar_indexed, tasks, chunksize=chunksize,
+                                       initializer=_similar_index_init, initargs=(similar_index,))
+            for key, msgid in results:
+                if msgid:
+                    # Try to get the same context, else just get one...
+                    skey = (key[0], msgid)
+                    if skey not in similar_pool[msgid]:
+                        skey = tuple(similar_pool[msgid])[0]
+                    # We keep org translation and comments, and mark message as fuzzy.
+                    msg, refmsg = self.msgs[skey].copy(), ref.msgs[key]
+                    msg.msgctxt = refmsg.msgctxt
+                    msg.msgid = refmsg.msgid
+                    msg.sources = refmsg.sources
+                    msg.is_fuzzy = True
+                    msg.is_commented = refmsg.is_commented
+                    msgs[key] = msg
+                else:
+                    msgs[key] = ref.msgs[key]
+            # Set in this process when it did the matching itself.
+            _similar_index_init(None)
         else:
             for key in new_keys:
                 msgs[key] = ref.msgs[key]
@@ -833,14 +1033,27 @@ class I18nMessages:
 
     def parse_messages_from_po(self, src, key=None):
         """
-        Parse a po file.
+        Parse a po file (or string), streaming over its lines.
         Note: This function will silently "arrange" mis-formatted entries, thus using afterward write_messages() should
               always produce a po-valid file, though not correct!
         """
-        reading_msgid = False
-        reading_msgstr = False
-        reading_msgctxt = False
-        reading_comment = False
+        # try to use src as file name...
+        if os.path.isfile(src):
+            if os.stat(src).st_size > self.settings.PARSER_MAX_FILE_SIZE:
+                # Security, else we could read arbitrary huge files!
+                print("WARNING: skipping file {}, too huge!".format(src))
+                return
+            if not key:
+                key = src
+            with open(src, 'r', encoding="utf-8") as f:
+                self._parse_messages_from_po_lines(line[:-1] if line.endswith("\n") else line for line in f)
+        else:
+            self._parse_messages_from_po_lines(src.splitlines())
+
+    def _parse_messages_from_po_lines(self, lines):
+        # What we are currently reading.
+        NONE, MSGCTXT, MSGID, MSGSTR = range(4)
+        reading = NONE
         is_commented = False
         is_fuzzy = False
         msgctxt_lines = []
@@ -848,43 +1061,25 @@ class I18nMessages:
         msgstr_lines = []
         comment_lines = []
 
+        msgs = self.msgs
+        parsing_errors = self.parsing_errors
         default_context = self.settings.DEFAULT_CONTEXT
+        do_unescape = I18nMessage.do_unescape
 
-        # Helper function
-        def finalize_message(self, line_nr):
-            nonlocal reading_msgid, reading_msgstr, reading_msgctxt, reading_comment
-            nonlocal is_commented, is_fuzzy, msgid_lines, msgstr_lines, msgctxt_lines, comment_lines
-
-            msgid = I18nMessage.do_unescape("".join(msgid_lines))
-            msgctxt = I18nMessage.do_unescape("".join(msgctxt_lines))
-            msgkey = (msgctxt or default_context, msgid)
+        # Helper function, lines are unescaped only once here, when the message is complete.
+        def finalize_message(line_nr):
+            msgctxt = [do_unescape(l) for l in msgctxt_lines]
+            msgid = [do_unescape(l) for l in msgid_lines]
+            msgkey = ("".join(msgctxt) or default_context, "".join(msgid))
 
             # Never allow overriding existing msgid/msgctxt pairs!
-            if msgkey in self.msgs:
-                self.parsing_errors.append((line_nr, "{} context/msgid is already in current messages!".format(msgkey)))
+            if msgkey in msgs:
+                parsing_errors.append((line_nr, "{} context/msgid is already in current messages!".format(msgkey)))
                 return
 
-            self.msgs[msgkey] = I18nMessage(msgctxt_lines, msgid_lines, msgstr_lines, comment_lines,
-                                            is_commented, is_fuzzy, settings=self.settings)
-
-            # Let's clean up and get ready for next message!
-            reading_msgid = reading_msgstr = reading_msgctxt = reading_comment = False
-            is_commented = is_fuzzy = False
-            msgctxt_lines = []
-            msgid_lines = []
-            msgstr_lines = []
-            comment_lines = []
-
-        # try to use src as file name...
-        if os.path.isfile(src):
-            if os.stat(src).st_size > self.settings.PARSER_MAX_FILE_SIZE:
-                # Security, else we could read arbitrary huge files!
-                print("WARNING: skipping file {}, too huge!".format(src))
-                return
-            if not key:
-                key = src
-            with open(src, 'r', encoding="utf-8") as f:
-                src = f.read()
+            msgs[msgkey] = I18nMessage(msgctxt, msgid, [do_unescape(l) for l in msgstr_lines],
+                                       [do_unescape(l) for l in comment_lines],
+                                       is_commented, is_fuzzy, settings=self.settings)
 
         _msgctxt = self.settings.PO_MSGCTXT
         _comm_msgctxt = self.settings.PO_COMMENT_PREFIX_MSG + _msgctxt
@@ -899,101 +1094,106 @@ class I18nMessages:
         _len_msgstr = len(_msgstr + '"')
         _len_comm_msgstr = len(_comm_msgstr + '"')
         _comm_str = self.settings.PO_COMMENT_PREFIX_MSG
+        _comm_char = _comm_str[0]
         _comm_fuzzy = self.settings.PO_COMMENT_FUZZY
         _len_comm_str = len(_comm_str + '"')
 
         # Main loop over all lines in src...
-        for line_nr, line in enumerate(src.splitlines()):
+        line_nr = 0
+        for line_nr, line in enumerate(lines):
             if line == "":
-                if reading_msgstr:
-                    finalize_message(self, line_nr)
+                if reading == MSGSTR:
+                    finalize_message(line_nr)
+                    # Let's clean up and get ready for next message!
+                    reading = NONE
+                    is_commented = is_fuzzy = False
+                    msgctxt_lines = []
+                    msgid_lines = []
+                    msgstr_lines = []
+                    comment_lines = []
                 continue
 
-            elif line.startswith(_msgctxt) or line.startswith(_comm_msgctxt):
-                reading_comment = False
-                reading_ctxt = True
-                if line.startswith(_comm_str):
-                    is_commented = True
-                    line = line[_len_comm_msgctxt:-1]
-                else:
-                    line = line[_len_msgctxt:-1]
-                msgctxt_lines.append(line)
-
-            elif line.startswith(_msgid) or line.startswith(_comm_msgid):
-                reading_comment = False
-                reading_msgid = True
-                if line.startswith(_comm_str):
-                    if not is_commented and reading_ctxt:
-                        self.parsing_errors.append((line_nr, "commented msgid following regular msgctxt"))
-                    is_commented = True
-                    line = line[_len_comm_msgid:-1]
-                else:
-                    line = line[_len_msgid:-1]
-                reading_ctxt = False
-                msgid_lines.append(line)
+            if line[0] != '"':
+                if line.startswith(_msgctxt) or line.startswith(_comm_msgctxt):
+                    reading = MSGCTXT
+                    if line.startswith(_comm_str):
+                        is_commented = True
+                        line = line[_len_comm_msgctxt:-1]
+                    else:
+                        line = line[_len_msgctxt:-1]
+                    msgctxt_lines.append(line)
+                    continue
 
-            elif line.startswith(_msgstr) or line.startswith(_comm_msgstr):
-                if not reading_msgid:
-                    self.parsing_errors.append((line_nr, "msgstr without a prior msgid"))
-                else:
-                    reading_msgid = False
-                reading_msgstr = True
-                if line.startswith(_comm_str):
-                    line = line[_len_comm_msgstr:-1]
-                    if not is_commented:
-                        self.parsing_errors.append((line_nr, "commented msgstr following regular msgid"))
-                else:
-                    line = line[_len_msgstr:-1]
-                    if is_commented:
-                        self.parsing_errors.append((line_nr, "regular msgstr following commented msgid"))
-                msgstr_lines.append(line)
-
-            elif line.startswith(_comm_str[0]):
-                if line.startswith(_comm_str):
-                    if reading_msgctxt:
-                        if is_commented:
-                            msgctxt_lines.append(line[_len_comm_str:-1])
-                        else:
-                            msgctxt_lines.append(line)
-                            self.parsing_errors.append((line_nr, "commented string while reading regular msgctxt"))
-                    elif reading_msgid:
-                        if is_commented:
-                            msgid_lines.append(line[_len_comm_str:-1])
-                        else:
-                            msgid_lines.append(line)
-                            self.parsing_errors.append((line_nr, "commented string while reading regular msgid"))
-                    elif reading_msgstr:
+                if line.startswith(_msgid) or line.startswith(_comm_msgid):
+                    if line.startswith(_comm_str):
+                        if not is_commented and reading == MSGCTXT:
+                            parsing_errors.append((line_nr, "commented msgid following regular msgctxt"))
+                        is_commented = True
+                        line = line[_len_comm_msgid:-1]
+                    else:
+                        line = line[_len_msgid:-1]
+                    reading = MSGID
+                    msgid_lines.append(line)
+                    continue
+
+                if line.startswith(_msgstr) or line.startswith(_comm_msgstr):
+                    if reading != MSGID:
+                        parsing_errors.append((line_nr, "msgstr without a prior msgid"))
+                    reading = MSGSTR
+                    if line.startswith(_comm_str):
+                        line = line[_len_comm_msgstr:-1]
+                        if not is_commented:
+                            parsing_errors.append((line_nr, "commented msgstr following regular msgid"))
+                    else:
+                        line = line[_len_msgstr:-1]
                         if is_commented:
-                            msgstr_lines.append(line[_len_comm_str:-1])
-                        else:
-                            msgstr_lines.append(line)
-                            self.parsing_errors.append((line_nr, "commented string while reading regular msgstr"))
-                else:
-                    if reading_msgctxt or reading_msgid or reading_msgstr:
-                        self.parsing_errors.append((line_nr,
-                                                    "commented string within msgctxt, msgid or msgstr scope, ignored"))
-                    elif line.startswith(_comm_fuzzy):
-                        is_fuzzy = True
+                            parsing_errors.append((line_nr, "regular msgstr following commented msgid"))
+                    msgstr_lines.append(line)
+                    continue
+
+                if line[0] == _comm_char:
+                    if line.startswith(_comm_str):
+                        if reading == MSGCTXT:
+                            if is_commented:
+                                msgctxt_lines.append(line[_len_comm_str:-1])
+                            else:
+                                msgctxt_lines.append(line)
+                                parsing_errors.append((line_nr, "commented string while reading regular msgctxt"))
+                        elif reading == MSGID:
+                            if is_commented:
+                                msgid_lines.append(line[_len_comm_str:-1])
+                            else:
+                                msgid_lines.append(line)
+                                parsing_errors.append((line_nr, "commented string while reading regular msgid"))
+                        elif reading == MSGSTR:
+                            if is_commented:
+                                msgstr_lines.append(line[_len_comm_str:-1])
+                            else:
+                                msgstr_lines.append(line)
+                                parsing_errors.append((line_nr, "commented string while reading regular msgstr"))
                     else:
-                        comment_lines.append(line)
-                    reading_comment = True
+                        if reading != NONE:
+                            parsing_errors.append((line_nr,
+                                                   "commented string within msgctxt, msgid or msgstr scope, ignored"))
+                        elif line.startswith(_comm_fuzzy):
+                            is_fuzzy = True
+                        else:
+                            comment_lines.append(line)
+                    continue
 
+            # Continuation of a multi-lines string (the most common case in big po files).
+            if reading == MSGCTXT:
+                msgctxt_lines.append(line[1:-1])
+            elif reading == MSGID:
+                msgid_lines.append(line[1:-1])
+            elif reading == MSGSTR:
+                msgstr_lines.append(line[1:-1])
             else:
-                if reading_msgctxt:
-                    msgctxt_lines.append(line[1:-1])
-                elif reading_msgid:
-                    msgid_lines.append(line[1:-1])
-                elif reading_msgstr:
-                    line = line[1:-1]
-                    msgstr_lines.append(line)
-                else:
-                    self.parsing_errors.append((line_nr, "regular string outside msgctxt, msgid or msgstr scope"))
-                    #self.parsing_errors += (str(comment_lines), str(msgctxt_lines), str(msgid_lines), str(msgstr_lines))
+                parsing_errors.append((line_nr, "regular string outside msgctxt, msgid or msgstr scope"))
 
         # If no final empty line, last message is not finalized!
-        if reading_msgstr:
-            finalize_message(self, line_nr)
-        self.unescape()
+        if reading == MSGSTR:
+            finalize_message(line_nr)
 
     def write(self, kind, dest):
         self.writers[kind](self, dest)
@@ -1060,78 +1260,34 @@ class I18nMessages:
         else:
             _write(self, fname, compact)
 
-    def write_messages_to_mo(self, fname):
+    def gen_mo_messages(self):
         """
-        Write messages in fname mo file.
+        Yield (msgid, msgstr) utf-8 encoded pairs of all messages to be written in a mo file, see gen_mo_data.
+        Only translated, non-fuzzy and non-commented messages are taken into account (as well as the header).
         """
-        # XXX Temp solution, until I can make own mo generator working...
-        import subprocess
-        with tempfile.NamedTemporaryFile(mode='w+', encoding="utf-8") as tmp_po_f:
-            self.write_messages_to_po(tmp_po_f)
-            cmd = (
-                self.settings.GETTEXT_MSGFMT_EXECUTABLE,
-                "--statistics",  # show stats
-                tmp_po_f.name,
-                "-o",
-                fname,
-            )
-            print("Running ", " ".join(cmd))
-            ret = subprocess.call(cmd)
-            print("Finished.")
-            return
-        # XXX Code below is currently broken (generates corrupted mo files it seems :( )!
-        # Using http://www.gnu.org/software/gettext/manual/html_node/MO-Files.html notation.
-        # Not generating hash table!
-        # Only translated, unfuzzy messages are taken into account!
         default_context = self.settings.DEFAULT_CONTEXT
-        msgs = tuple(v for v in self.msgs.values() if not (v.is_fuzzy or v.is_commented) and v.msgstr and v.msgid)
-        msgs = sorted(msgs[:2],
-                      key=lambda e: (e.msgctxt + e.msgid) if (e.msgctxt and e.msgctxt != default_context) else e.msgid)
-        magic_nbr = 0x950412de
-        format_rev = 0
-        N = len(msgs)
-        O = 32
-        T = O + N * 8
-        S = 0
-        H = T + N * 8
-        # Prepare our data! we need key (optional context and msgid), translation, and offset and length of both.
-        # Offset are relative to start of their own list.
-        EOT = b"0x04"  # Used to concatenate context and msgid
-        _msgid_offset = 0
-        _msgstr_offset = 0
-
-        def _gen(v):
-            nonlocal _msgid_offset, _msgstr_offset
-            msgid = v.msgid.encode("utf-8")
-            msgstr = v.msgstr.encode("utf-8")
-            if v.msgctxt and v.msgctxt != default_context:
-                msgctxt = v.msgctxt.encode("utf-8")
-                msgid = msgctxt + EOT + msgid
-            # Don't forget the final NULL char!
-            _msgid_len = len(msgid) + 1
-            _msgstr_len = len(msgstr) + 1
-            ret = ((msgid, _msgid_len, _msgid_offset), (msgstr, _msgstr_len, _msgstr_offset))
-            _msgid_offset += _msgid_len
-            _msgstr_offset += _msgstr_len
-            return ret
-        msgs = tuple(_gen(v) for v in msgs)
-        msgid_start = H
-        msgstr_start = msgid_start + _msgid_offset
-        print(N, msgstr_start + _msgstr_offset)
-        print(msgs)
-
-        with open(fname, 'wb') as f:
-            # Header...
-            f.write(struct.pack("=8I", magic_nbr, format_rev, N, O, T, S, H, 0))
-            # Msgid's length and offset.
-            f.write(b"".join(struct.pack("=2I", length, msgid_start + offset) for (_1, length, offset), _2 in msgs))
-            # Msgstr's length and offset.
-            f.write(b"".join(struct.pack("=2I", length, msgstr_start + offset) for _1, (_2, length, offset) in msgs))
-            # No hash table!
-            # Msgid's.
-            f.write(b"\0".join(msgid for (msgid, _1, _2), _3 in msgs) + b"\0")
-            # Msgstr's.
-            f.write(b"\0".join(msgstr for _1, (msgstr, _2, _3) in msgs) + b"\0")
+        header_key = self.settings.PO_HEADER_KEY
+        for key, msg in self.msgs.items():
+            if msg.is_commented or not msg.msgstr:
+                continue
+            if (msg.is_fuzzy or not msg.msgid) and key != header_key:
+                continue
+            msgid = msg.msgid.encode("utf-8")
+            if msg.msgctxt and msg.msgctxt != default_context:
+                msgid = msg.msgctxt.encode("utf-8") + b"\x04" + msgid
+            yield msgid, msg.msgstr.encode("utf-8")
+
+    def write_messages_to_mo(self, fname):
+        """
+        Write messages in fname mo file (including the hash table), without using msgfmt.
+        """
+        data = gen_mo_data(self.gen_mo_messages())
+        if isinstance(fname, str):
+            with open(fname, 'wb') as f:
+                f.write(data)
+        # Else assume fname is already a binary file(like) object!
+        else:
+            fname.write(data)
 
     parsers = {
         "PO": parse_messages_from_po,
@@ -1189,6 +1345,9 @@ class I18n:
                         return os.path.join(os.path.dirname(path), "blender.pot")
                 if not path.endswith(".po"):
                     return os.path.join(os.path.dirname(path), uid + ".po")
+            elif kind == 'MO':
+                if not path.endswith(".mo"):
+                    return os.path.join(os.path.dirname(path), uid + ".mo")
             elif kind == 'PY':
                 if not path.endswith(".py"):
                     if self.src.get(self.settings.PARSER_PY_ID):
@@ -1330,11 +1489,11 @@ class I18n:
         if pot_file and os.path.isfile(pot_file):
             self.trans[self.settings.PARSER_TEMPLATE_ID] = I18nMessages(self.settings.PARSER_TEMPLATE_ID, 'PO',
                                                                         pot_file, pot_file, settings=self.settings)
-            self.src_po[self.settings.PARSER_TEMPLATE_ID] = pot_file
+            self.src[self.settings.PARSER_TEMPLATE_ID] = pot_file
 
         for uid, po_file in get_po_files_from_dir(root_dir, langs):
             self.trans[uid] = I18nMessages(uid, 'PO', po_file, po_file, settings=self.settings)
-            self.src_po[uid] = po_file
+            self.src[uid] = po_file
 
     def parse_from_py(self, src, langs=set()):
         """
@@ -1394,6 +1553,21 @@ class I18n:
             dst = self.dst(self, self.src.get(uid, ""), uid, 'PO')
             self.trans[uid].write('PO', dst)
 
+    def write_to_mo(self, langs=set()):
+        """
+        Compile all translations into mo files, without msgfmt (in parallel on Linux). By default, write iso_CODE.mo
+        files in the same dir as the source, specify a custom self.dst function to write somewhere else!
+        Note: The pot template ({}) is never compiled.
+        """.format(self.settings.PARSER_TEMPLATE_ID)
+        keys = self.trans.keys() - {self.settings.PARSER_TEMPLATE_ID}
+        if langs:
+            keys &= langs
+        tasks = tuple((self.dst(self, self.src.get(uid, ""), uid, 'MO'), tuple(self.trans[uid].gen_mo_messages()))
+                      for uid in keys)
+        # Consume results, so that errors in workers are raised here.
+        for _ in process_pool_map(_write_mo_file, tasks):
+            pass
+
     def write_to_py(self, langs=set()):
         """
         Write all translations as python code, either in a "translations.py" file under same dir as source(s), or in
@@ -1555,5 +1729,6 @@ class I18n:
 
     writers = {
         "PO": write_to_po,
+        "MO": write_to_mo,
         "PY": write_to_py,
     }
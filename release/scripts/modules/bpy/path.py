@@ -35,6 +35,7 @@ __all__ = (
     "extensions_movie",
     "extensions_audio",
     "is_subdir",
+    "listdir_cache",
     "module_names",
     "native_pathsep",
     "reduce_dirs",
@@ -248,6 +249,104 @@ def display_name_from_filepath(name):
     return name
 
 
+class _ListdirCache:
+    __slots__ = (
+        "users",
+        "listdir_lower",
+        "walk_lower",
+    )
+
+    def __init__(self):
+        self.users = 0
+        # Directory path -> {lower case name: name} or None.
+        self.listdir_lower = {}
+        # Directory path -> {lower case name: [path, ...]}.
+        self.walk_lower = {}
+
+
+# Only set while 'listdir_cache' is in use.
+_listdir_cache = None
+
+
+def listdir_cache():
+    """
+    Context manager, caching directory listings used by
+    :func:`resolve_ncase` and :func:`bpy_extras.image_utils.load_image`
+    (for recursive searches) until the outermost context exits.
+
+    Useful when resolving many paths at once, when importing for example.
+    Changes to the file-system made while the cache is in use may be missed.
+
+    .. code-block:: python
+
+       with bpy.path.listdir_cache():
+           for filepath in texture_paths:
+               image = load_image(filepath, dirname, recursive=True)
+    """
+    from contextlib import contextmanager
+
+    @contextmanager
+    def listdir_cache_scope():
+        global _listdir_cache
+        cache = _listdir_cache
+        if cache is None:
+            cache = _listdir_cache = _ListdirCache()
+        cache.users += 1
+        try:
+            yield
+        finally:
+            cache.users -= 1
+            if not cache.users:
+                _listdir_cache = None
+
+    return listdir_cache_scope()
+
+
+def _listdir_lower(dirpath):
+    """
+    Return a dict mapping lower case names to the first name matching
+    in the directory, None when it can't be listed.
+    """
+    cache = _listdir_cache
+    if cache is not None and dirpath in cache.listdir_lower:
+        return cache.listdir_lower[dirpath]
+
+    try:
+        files = _os.listdir(dirpath)
+    except PermissionError:
+        # We might not have the permission to list dirpath...
+        files_lower = None
+    else:
+        files_lower = {}
+        for f_iter in files:
+            files_lower.setdefault(f_iter.lower(), f_iter)
+
+    if cache is not None:
+        cache.listdir_lower[dirpath] = files_lower
+    return files_lower
+
+
+def _walk_lower_cached(path):
+    """
+    Return a dict mapping lower case file names to all paths found
+    when walking the directory (in :func:`os.walk` order),
+    None when :func:`listdir_cache` is not in use.
+    """
+    cache = _listdir_cache
+    if cache is None:
+        return None
+
+    files_lower = cache.walk_lower.get(path)
+    if files_lower is None:
+        files_lower = cache.walk_lower[path] = {}
+        for dirpath, _dirnames, filenames in _os.walk(path):
+            for filename in filenames:
+                files_lower.setdefault(filename.lower(), []).append(
+                    _os.path.join(dirpath, filename)
+                )
+    return files_lower
+
+
 def resolve_ncase(path):
     """
     Resolve a case insensitive path on a case sensitive system,
@@ -283,21 +382,13 @@ def resolve_ncase(path):
 
         # we are expecting 'dirpath' to be a directory, but it could be a file
         if _os.path.isdir(dirpath):
-            try:
-                files = _os.listdir(dirpath)
-            except PermissionError:
-                # We might not have the permission to list dirpath...
+            files_lower = _listdir_lower(dirpath)
+            if files_lower is None:
                 return path, False
         else:
             return path, False
 
-        filename_low = filename.lower()
-        f_iter_nocase = None
-
-        for f_iter in files:
-            if f_iter.lower() == filename_low:
-                f_iter_nocase = f_iter
-                break
+        f_iter_nocase = files_lower.get(filename.lower())
 
         if f_iter_nocase:
             return _os.path.join(dirpath, f_iter_nocase) + suffix, True
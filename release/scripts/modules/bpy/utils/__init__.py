@@ -29,6 +29,7 @@ __all__ = (
     "keyconfig_init",
     "keyconfig_set",
     "load_scripts",
+    "load_scripts_report",
     "modules_from_path",
     "preset_find",
     "preset_paths",
@@ -36,6 +37,7 @@ __all__ = (
     "app_template_paths",
     "register_class",
     "register_manual_map",
+    "register_ui_deferred",
     "unregister_manual_map",
     "register_classes_factory",
     "register_submodule_factory",
@@ -54,6 +56,7 @@ __all__ = (
     "unregister_tool",
     "user_resource",
     "execfile",
+    "hierarchy_index",
 )
 
 from _bpy import (
@@ -78,6 +81,89 @@ _preferences = _bpy.context.preferences
 _script_module_dirs = "startup", "modules"
 _is_factory_startup = _bpy.app.factory_startup
 
+# Startup modules which only define user interface (panels, menus, UI lists),
+# these may be deferred, see: 'load_scripts(use_lazy_ui=True)'.
+_script_modules_ui = {"bl_ui"}
+# Names of deferred modules, registered by 'register_ui_deferred'.
+_script_modules_ui_deferred = []
+
+# Profile of scripts & add-ons in the order they're loaded,
+# see: 'load_scripts_report'.
+_script_profile = []
+# {(type, module_name): record} for records in '_script_profile'.
+_script_profile_lookup = {}
+_script_profile_info = {"load_scripts_time": 0.0}
+
+
+def _script_profile_begin():
+    from time import perf_counter
+    import tracemalloc
+    if tracemalloc.is_tracing():
+        memory = tracemalloc.get_traced_memory()[0]
+    else:
+        memory = None
+    return perf_counter(), memory
+
+
+def _script_profile_end(profile_type, module_name, key, begin):
+    from time import perf_counter
+    import tracemalloc
+    time_begin, memory_begin = begin
+
+    record = _script_profile_lookup.get((profile_type, module_name))
+    if record is None:
+        record = _script_profile_lookup[profile_type, module_name] = {
+            "type": profile_type,
+            "module": module_name,
+            "import_time": 0.0,
+            "import_memory": None,
+            "register_time": 0.0,
+            "register_memory": None,
+        }
+        _script_profile.append(record)
+
+    record[key + "_time"] = time_delta = perf_counter() - time_begin
+    if memory_begin is not None and tracemalloc.is_tracing():
+        record[key + "_memory"] = (
+            tracemalloc.get_traced_memory()[0] - memory_begin
+        )
+    return time_delta
+
+
+def load_scripts_report(filepath=None):
+    """
+    Return a report of the time (in seconds) and memory (in bytes)
+    taken to import & register each startup script and add-on,
+    in the order they were loaded.
+
+    Memory is only measured for Python allocations while :mod:`tracemalloc`
+    is tracing, otherwise it's None.
+
+    Setting the ``BLENDER_PY_PROFILE_STARTUP`` environment variable
+    to a file path writes this report once Blender has loaded scripts,
+    with memory tracing enabled.
+
+    :arg filepath: Optionally write the report to this file as JSON.
+    :type filepath: string
+    :return: a dictionary with a "modules" list,
+       each item has "type" ('STARTUP', 'DEFERRED' or 'ADDON'), "module",
+       "import_time", "import_memory", "register_time" & "register_memory".
+       'DEFERRED' scripts are interface scripts loaded after startup,
+       see :func:`register_ui_deferred`.
+    :rtype: dict
+    """
+    import tracemalloc
+    report = {
+        **_script_profile_info,
+        "memory_traced": tracemalloc.is_tracing(),
+        "modules": [record.copy() for record in _script_profile],
+    }
+    if filepath is not None:
+        import json
+        with open(filepath, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=1)
+    return report
+
 
 def execfile(filepath, mod=None):
     # module name isn't used or added to 'sys.modules'.
@@ -91,7 +177,7 @@ def execfile(filepath, mod=None):
     return mod
 
 
-def _test_import(module_name, loaded_modules):
+def _test_import(module_name, loaded_modules, profile_type='STARTUP'):
     use_time = _bpy.app.debug_python
 
     if module_name in loaded_modules:
@@ -101,9 +187,9 @@ def _test_import(module_name, loaded_modules):
               "multiple periods" % module_name)
         return None
 
-    if use_time:
-        import time
-        t = time.time()
+    # Only profile the first import, others only look up 'sys.modules'.
+    use_profile = module_name not in _sys.modules
+    profile = _script_profile_begin()
 
     try:
         mod = __import__(module_name)
@@ -112,13 +198,33 @@ def _test_import(module_name, loaded_modules):
         traceback.print_exc()
         return None
 
-    if use_time:
-        print("time %s %.4f" % (module_name, time.time() - t))
+    if use_profile:
+        t = _script_profile_end(profile_type, module_name, "import", profile)
+        if use_time:
+            print("time %s %.4f" % (module_name, t))
 
     loaded_modules.add(mod.__name__)  # should match mod.__name__ too
     return mod
 
 
+def _register_module_call(mod, profile_type='STARTUP'):
+    register = getattr(mod, "register", None)
+    if register:
+        profile = _script_profile_begin()
+        try:
+            register()
+        except:
+            import traceback
+            traceback.print_exc()
+        t = _script_profile_end(profile_type, mod.__name__, "register", profile)
+        if _bpy.app.debug_python:
+            print("time register %s %.4f" % (mod.__name__, t))
+    else:
+        print("\nWarning! '%s' has no register function, "
+              "this is now a requirement for registerable scripts" %
+              mod.__file__)
+
+
 # Reloading would add twice.
 def _sys_path_ensure_prepend(path):
     if path not in _sys.path:
@@ -156,7 +262,62 @@ _global_loaded_modules = []  # store loaded module names for reloading.
 import bpy_types as _bpy_types  # keep for comparisons, never ever reload this.
 
 
-def load_scripts(reload_scripts=False, refresh_scripts=False):
+def register_ui_deferred():
+    """
+    Load & register user interface scripts deferred by lazy loading,
+    this does nothing when there are no deferred scripts.
+
+    :return: the names of the modules registered.
+    :rtype: list of strings
+    """
+    if not _script_modules_ui_deferred:
+        return []
+
+    from bpy_restrict_state import RestrictBlend
+
+    module_names = _script_modules_ui_deferred[:]
+    _script_modules_ui_deferred.clear()
+
+    with RestrictBlend():
+        for mod_name in module_names:
+            mod = _test_import(mod_name, set(), 'DEFERRED')
+            if mod:
+                _register_module_call(mod, 'DEFERRED')
+                _global_loaded_modules.append(mod.__name__)
+
+    return module_names
+
+
+def _modules_defer_ui(path, loaded_modules):
+    # Defer interface modules which haven't been loaded yet,
+    # adding to 'loaded_modules' so they're skipped when loading 'path'.
+    for mod_name, _mod_path in _bpy.path.module_names(path):
+        if (
+                (mod_name in _script_modules_ui) and
+                (mod_name not in loaded_modules) and
+                (mod_name not in _sys.modules)
+        ):
+            loaded_modules.add(mod_name)
+            _script_modules_ui_deferred.append(mod_name)
+
+
+def _register_ui_deferred_timer():
+    register_ui_deferred()
+    # Run once.
+    return None
+
+
+def _use_lazy_ui_default():
+    # Environment variable so this can be set for command line rendering.
+    return _os.environ.get("BLENDER_PY_LAZY_UI", "0") not in {"", "0"}
+
+
+def load_scripts(
+        reload_scripts=False,
+        refresh_scripts=False,
+        *,
+        use_lazy_ui=None,
+):
     """
     Load scripts and run each modules register function.
 
@@ -166,13 +327,32 @@ def load_scripts(reload_scripts=False, refresh_scripts=False):
     :arg refresh_scripts: only load scripts which are not already loaded
        as modules.
     :type refresh_scripts: bool
+    :arg use_lazy_ui: Defer loading startup scripts which only define
+       the user interface. In background mode they are skipped,
+       otherwise they're loaded once the event loop runs.
+       Either way they're loaded when calling :func:`register_ui_deferred`,
+       which should be done before accessing the interface
+       (including the window-manager properties these scripts define).
+       Enabling an add-on calls :func:`register_ui_deferred` first
+       (so it can extend built-in panels & menus), unless its ``bl_info``
+       sets ``"lazy_ui": True``.
+       When None, the ``BLENDER_PY_LAZY_UI`` environment variable is used.
+    :type use_lazy_ui: bool
     """
     use_time = use_class_register_check = _bpy.app.debug_python
     use_user = not _is_factory_startup
 
-    if use_time:
-        import time
-        t_main = time.time()
+    if use_lazy_ui is None:
+        use_lazy_ui = _use_lazy_ui_default()
+
+    profile_filepath = _os.environ.get("BLENDER_PY_PROFILE_STARTUP")
+    if profile_filepath:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    from time import perf_counter
+    t_main = perf_counter()
 
     loaded_modules = set()
 
@@ -187,19 +367,6 @@ def load_scripts(reload_scripts=False, refresh_scripts=False):
         for module_name in [ext.module for ext in _preferences.addons]:
             _addon_utils.disable(module_name)
 
-    def register_module_call(mod):
-        register = getattr(mod, "register", None)
-        if register:
-            try:
-                register()
-            except:
-                import traceback
-                traceback.print_exc()
-        else:
-            print("\nWarning! '%s' has no register function, "
-                  "this is now a requirement for registerable scripts" %
-                  mod.__file__)
-
     def unregister_module_call(mod):
         unregister = getattr(mod, "unregister", None)
         if unregister:
@@ -233,9 +400,12 @@ def load_scripts(reload_scripts=False, refresh_scripts=False):
             mod = test_reload(mod)
 
         if mod:
-            register_module_call(mod)
+            _register_module_call(mod)
             _global_loaded_modules.append(mod.__name__)
 
+    # Deferred modules are found again below.
+    _script_modules_ui_deferred.clear()
+
     if reload_scripts:
 
         # module names -> modules
@@ -263,9 +433,18 @@ def load_scripts(reload_scripts=False, refresh_scripts=False):
 
                     # Only add to 'sys.modules' unless this is 'startup'.
                     if path_subdir == "startup":
+                        if use_lazy_ui:
+                            _modules_defer_ui(path, loaded_modules)
                         for mod in modules_from_path(path, loaded_modules):
                             test_register(mod)
 
+    if _script_modules_ui_deferred and not _bpy.app.background:
+        _bpy.app.timers.register(
+            _register_ui_deferred_timer,
+            first_interval=0.0,
+            persistent=True,
+        )
+
     # load template (if set)
     if any(_bpy.utils.app_template_paths()):
         import bl_app_template_utils
@@ -286,8 +465,16 @@ def load_scripts(reload_scripts=False, refresh_scripts=False):
         import gc
         print("gc.collect() -> %d" % gc.collect())
 
+    t_main = perf_counter() - t_main
+    _script_profile_info["load_scripts_time"] = t_main
     if use_time:
-        print("Python Script Load Time %.4f" % (time.time() - t_main))
+        print("Python Script Load Time %.4f" % t_main)
+
+    if profile_filepath:
+        try:
+            load_scripts_report(profile_filepath)
+        except Exception as ex:
+            print("Error writing startup profile:", repr(profile_filepath), ex)
 
     if use_class_register_check:
         for cls in _bpy.types.bpy_struct.__subclasses__():
@@ -963,16 +1150,88 @@ def unregister_tool(tool_cls):
             kc.keymaps.remove(km)
 
 
+# -----------------------------------------------------------------------------
+# Hierarchy lookups
+
+@_bpy.app.handlers.persistent
+def _hierarchy_index_clear(*_args):
+    index = _bpy_types._hierarchy_index
+    if index is not None:
+        index.clear()
+
+
+def hierarchy_index():
+    """
+    Context manager that speeds up hierarchy lookups while in use.
+
+    :class:`bpy.types.Object` ``children``, ``users_collection`` &
+    ``users_scene`` and bone ``children``, ``children_recursive`` &
+    ``children_recursive_basename`` use lookup tables,
+    built in one pass over all data when first needed.
+
+    The tables are cleared after depsgraph updates, undo, redo and
+    file loading, changes made by the script itself may need
+    :meth:`bpy.types.ViewLayer.update` to be seen.
+
+    .. code-block:: python
+
+       with bpy.utils.hierarchy_index():
+           for ob in bpy.data.objects:
+               print(ob.name, ob.children)
+    """
+    from contextlib import contextmanager
+
+    handlers = (
+        _bpy.app.handlers.depsgraph_update_post,
+        _bpy.app.handlers.undo_post,
+        _bpy.app.handlers.redo_post,
+        _bpy.app.handlers.load_post,
+    )
+
+    @contextmanager
+    def hierarchy_index_scope():
+        index = _bpy_types._hierarchy_index
+        if index is None:
+            index = _bpy_types._hierarchy_index = _bpy_types._HierarchyIndex()
+            for handler in handlers:
+                handler.append(_hierarchy_index_clear)
+        index.users += 1
+        try:
+            yield
+        finally:
+            index.users -= 1
+            if not index.users:
+                _bpy_types._hierarchy_index = None
+                for handler in handlers:
+                    if _hierarchy_index_clear in handler:
+                        handler.remove(_hierarchy_index_clear)
+
+    return hierarchy_index_scope()
+
+
 # -----------------------------------------------------------------------------
 # Manual lookups, each function has to return a basepath and a sequence
 # of...
 
+# Cache of the default manual map, (key, (prefix, mapping)).
+_blender_default_map_cache = None
+
+
 # we start with the built-in default mapping
 def _blender_default_map():
+    global _blender_default_map_cache
+    # The manual prefix only depends on the language settings,
+    # keep the same mapping so lookups on it can be cached too.
+    view = _bpy.context.preferences.view
+    key = (view.use_international_fonts, view.language, _os.getenv('LANG', ''))
+    cache = _blender_default_map_cache
+    if cache is not None and cache[0] == key:
+        return cache[1]
     import rna_manual_reference as ref_mod
     ret = (ref_mod.url_manual_prefix, ref_mod.url_manual_mapping)
-    # avoid storing in memory
+    # avoid keeping the module in memory, only the cached map.
     del _sys.modules["rna_manual_reference"]
+    _blender_default_map_cache = key, ret
     return ret
 
 
@@ -111,6 +111,232 @@ def bake_action_objects_iter(
     yield tuple(iter.send(None) for iter in iter_all)
 
 
+class _BakeTrack:
+    """
+    Transform channels sampled for one bone or object,
+    each channel stores a value per baked frame.
+    """
+    __slots__ = (
+        "data_path_prefix",
+        "group",
+        "rotation_mode",
+        "rotation_prev",
+        "props",
+        "channels",
+    )
+
+    def __init__(self, data_path_prefix, group, rotation_mode, props_extra=()):
+        from array import array
+
+        self.data_path_prefix = data_path_prefix
+        self.group = group
+        self.rotation_mode = rotation_mode
+        # Used to create compatible eulers, quats.
+        self.rotation_prev = None
+
+        if rotation_mode == 'QUATERNION':
+            rotation_prop = ("rotation_quaternion", 4)
+        elif rotation_mode == 'AXIS_ANGLE':
+            rotation_prop = ("rotation_axis_angle", 4)
+        else:  # euler, XYZ, ZXY etc
+            rotation_prop = ("rotation_euler", 3)
+
+        # (property, array_index) for each channel.
+        self.props = [
+            (prop, i)
+            for prop, prop_len in (("location", 3), rotation_prop, ("scale", 3))
+            for i in range(prop_len)
+        ]
+        self.props.extend((prop, 0) for prop in props_extra)
+        self.channels = [array('f') for _ in self.props]
+
+    def sample(self, matrix, values_extra=()):
+        loc, quat, scale = matrix.decompose()
+        rotation_mode = self.rotation_mode
+        rotation_prev = self.rotation_prev
+        if rotation_mode == 'QUATERNION':
+            if rotation_prev is not None:
+                quat.make_compatible(rotation_prev)
+            rot = self.rotation_prev = quat
+        elif rotation_mode == 'AXIS_ANGLE':
+            axis, angle = quat.to_axis_angle()
+            rot = (angle, *axis)
+        else:  # euler, XYZ, ZXY etc
+            if rotation_prev is not None:
+                rot = quat.to_euler(rotation_mode, rotation_prev)
+            else:
+                rot = quat.to_euler(rotation_mode)
+            self.rotation_prev = rot
+
+        for channel, value in zip(
+                self.channels,
+                (*loc, *rot, *scale, *values_extra),
+        ):
+            channel.append(value)
+
+    def write(self, action, frames, keyframe_types):
+        for (prop, index), values in zip(self.props, self.channels):
+            _bake_fcurve_write(
+                action,
+                self.data_path_prefix + prop,
+                index,
+                self.group,
+                frames,
+                values,
+                keyframe_types,
+            )
+
+
+def _bake_keyframe_types(context):
+    # The (interpolation, handle type) of new keys, as used by 'keyframe_insert'.
+    edit = context.preferences.edit
+    return edit.keyframe_new_interpolation_type, edit.keyframe_new_handle_type
+
+
+def _bake_fcurve_write(action, data_path, index, group, frames, values, keyframe_types):
+    # Write all keyframes of an F-Curve at once,
+    # replacing existing keys on the baked frames (as inserting keys would).
+    from array import array
+
+    fcurves = action.fcurves
+    fcu = fcurves.find(data_path, index=index)
+    if fcu is None:
+        fcu = fcurves.new(data_path, index=index, action_group=group)
+
+    keyframe_points = fcu.keyframe_points
+    co = array('f', [0.0, 0.0]) * len(keyframe_points)
+    if co:
+        keyframe_points.foreach_get("co", co)
+        frames_set = set(frames)
+        keyframes_remove = [
+            i for i in range(len(keyframe_points))
+            if co[i * 2] in frames_set
+        ]
+        if keyframes_remove:
+            for i in reversed(keyframes_remove):
+                keyframe_points.remove(keyframe_points[i], fast=True)
+            co = array('f', [0.0, 0.0]) * len(keyframe_points)
+            keyframe_points.foreach_get("co", co)
+
+    co_new = array('f', [0.0, 0.0]) * len(frames)
+    co_new[0::2] = frames
+    co_new[1::2] = values
+    co.extend(co_new)
+
+    keyframe_points.add(len(frames))
+    keyframe_points.foreach_set("co", co)
+
+    # Match the settings 'keyframe_insert' uses for new keys. Keys added by
+    # the API have zeroed easing settings & don't use the preferences.
+    keyframes_new = range(len(keyframe_points) - len(frames), len(keyframe_points))
+    easing = array('f', [0.0]) * len(keyframe_points)
+    for attr, value in (("back", 1.70158), ("amplitude", 0.8), ("period", 4.1)):
+        keyframe_points.foreach_get(attr, easing)
+        for i in keyframes_new:
+            easing[i] = value
+        keyframe_points.foreach_set(attr, easing)
+
+    # Enums can't be accessed with 'foreach_set', only set them
+    # when they differ from the defaults of keys added by the API.
+    interpolation, handle_type = keyframe_types
+    if interpolation != 'BEZIER' or handle_type != 'AUTO_CLAMPED':
+        for i in keyframes_new:
+            key = keyframe_points[i]
+            key.interpolation = interpolation
+            key.handle_left_type = key.handle_right_type = handle_type
+
+    # Sort and calculate handles.
+    fcu.update()
+
+
+def _bake_clean_fcurve(fcu, values_keep, threshold=0.0001):
+    """
+    Remove keyframes which have (almost) the same value as their neighbors,
+    keeping the first & last keys and keys with values in ``values_keep``.
+
+    :return: the number of keyframes removed.
+    """
+    from array import array
+
+    keyframe_points = fcu.keyframe_points
+    keyframes_len = len(keyframe_points)
+    if keyframes_len < 3:
+        return 0
+
+    co = array('f', [0.0, 0.0]) * keyframes_len
+    keyframe_points.foreach_get("co", co)
+    values = co[1::2]
+
+    # Compare each key with the previous key which is kept
+    # and the next key (matching removal of keys one at a time).
+    keep = [0]
+    val_prev = values[0]
+    for i in range(1, keyframes_len - 1):
+        val = values[i]
+        if (
+                (val not in values_keep) and
+                (abs(val - val_prev) + abs(val - values[i + 1]) < threshold)
+        ):
+            continue
+        keep.append(i)
+        val_prev = val
+    keep.append(keyframes_len - 1)
+
+    keyframes_len_new = len(keep)
+    if keyframes_len_new == keyframes_len:
+        return 0
+
+    # Move kept keys to the start of the array, then remove the remaining
+    # keys from the end (avoids moving memory for every removal).
+    for attr, attr_len, typecode in _bake_clean_keyframe_attrs:
+        data = array(typecode, [0]) * (keyframes_len * attr_len)
+        keyframe_points.foreach_get(attr, data)
+        if attr_len == 1:
+            data_new = array(typecode, [data[i] for i in keep])
+        else:
+            data_new = array(typecode)
+            for i in keep:
+                data_new.extend(data[i * attr_len:(i + 1) * attr_len])
+        data[:len(data_new)] = data_new
+        keyframe_points.foreach_set(attr, data)
+
+    # Enums can't be accessed in bulk, only copy keys which moved.
+    for i_new, i in enumerate(keep):
+        if i_new != i:
+            kp_src = keyframe_points[i]
+            kp_dst = keyframe_points[i_new]
+            for attr in _bake_clean_keyframe_enums:
+                setattr(kp_dst, attr, getattr(kp_src, attr))
+
+    for _ in range(keyframes_len - keyframes_len_new):
+        keyframe_points.remove(keyframe_points[-1], fast=True)
+
+    fcu.update()
+    return keyframes_len - keyframes_len_new
+
+
+# (attribute, size, array typecode) of keyframe data which can be accessed in bulk.
+_bake_clean_keyframe_attrs = (
+    ("co", 2, 'f'),
+    ("handle_left", 2, 'f'),
+    ("handle_right", 2, 'f'),
+    ("back", 1, 'f'),
+    ("amplitude", 1, 'f'),
+    ("period", 1, 'f'),
+    ("select_control_point", 1, 'b'),
+    ("select_left_handle", 1, 'b'),
+    ("select_right_handle", 1, 'b'),
+)
+
+_bake_clean_keyframe_enums = (
+    "interpolation",
+    "easing",
+    "handle_left_type",
+    "handle_right_type",
+    "type",
+)
+
+
 # XXX visual keying is actually always considered as True in this code...
 def bake_action_iter(
         obj,
@@ -122,7 +348,8 @@ def bake_action_iter(
         do_visual_keying=True,
         do_constraint_clear=False,
         do_parents_clear=False,
-        do_clean=False
+        do_clean=False,
+        do_batch=False
 ):
     """
     An coroutine that bakes action for a single object.
@@ -146,6 +373,11 @@ def bake_action_iter(
     :type do_parents_clear: bool
     :arg do_clean: Remove redundant keyframes after baking.
     :type do_clean: bool
+    :arg do_batch: Store samples in arrays and write all keyframes of each
+       F-Curve at once, instead of inserting keyframes one at a time.
+       Unlike inserting, keys are written for every frame (use ``do_clean``
+       to remove redundant keys).
+    :type do_batch: bool
 
     :return: an action or None
     :rtype: :class:`bpy.types.Action`
@@ -218,6 +450,37 @@ def bake_action_iter(
 
     options = {'INSERTKEY_NEEDED'}
 
+    if do_batch:
+        from array import array
+        frames_batch = array('f')
+        pose_tracks = []
+        obj_track = None
+        if do_pose:
+            from bpy.utils import escape_identifier
+            for name, pbone in obj.pose.bones.items():
+                if only_selected and not pbone.bone.select:
+                    continue
+                pose_tracks.append((pbone, _BakeTrack(
+                    'pose.bones["%s"].' % escape_identifier(name),
+                    name,
+                    pbone.rotation_mode,
+                    BBONE_PROPS if pbone.bone.bbone_segments > 1 else (),
+                )))
+        if do_object:
+            obj_track = _BakeTrack("", "Action Bake", obj.rotation_mode)
+
+        def pose_frame_sample(obj):
+            for pbone, track in pose_tracks:
+                if do_visual_keying:
+                    matrix = obj.convert_space(pose_bone=pbone, matrix=pbone.matrix,
+                                               from_space='POSE', to_space='LOCAL')
+                else:
+                    matrix = pbone.matrix_basis
+                if pbone.bone.bbone_segments > 1:
+                    track.sample(matrix, [getattr(pbone, bb_prop) for bb_prop in BBONE_PROPS])
+                else:
+                    track.sample(matrix)
+
     # -------------------------------------------------------------------------
     # Collect transformations
 
@@ -229,6 +492,14 @@ def bake_action_iter(
         if frame is None:
             break
 
+        if do_batch:
+            frames_batch.append(frame)
+            if do_pose:
+                pose_frame_sample(obj)
+            if do_object:
+                obj_track.sample(obj_frame_info(obj))
+            continue
+
         if do_pose:
             pose_info.append((frame, *pose_frame_info(obj)))
         if do_object:
@@ -237,7 +508,12 @@ def bake_action_iter(
     # -------------------------------------------------------------------------
     # Clean (store initial data)
     if do_clean and action is not None:
-        clean_orig_data = {fcu: {p.co[1] for p in fcu.keyframe_points} for fcu in action.fcurves}
+        from array import array
+        clean_orig_data = {}
+        for fcu in action.fcurves:
+            co = array('f', [0.0, 0.0]) * len(fcu.keyframe_points)
+            fcu.keyframe_points.foreach_get("co", co)
+            clean_orig_data[fcu] = set(co[1::2])
     else:
         clean_orig_data = {}
 
@@ -264,6 +540,26 @@ def bake_action_iter(
     # -------------------------------------------------------------------------
     # Apply transformations to action
 
+    if do_batch:
+        keyframe_types = _bake_keyframe_types(bpy.context)
+        if do_pose:
+            for pbone, track in pose_tracks:
+                if do_constraint_clear:
+                    while pbone.constraints:
+                        pbone.constraints.remove(pbone.constraints[0])
+                track.write(action, frames_batch, keyframe_types)
+
+        if do_object:
+            if do_constraint_clear:
+                while obj.constraints:
+                    obj.constraints.remove(obj.constraints[0])
+            obj_track.write(action, frames_batch, keyframe_types)
+            if do_parents_clear:
+                obj.parent = None
+
+        # Skip inserting keys below.
+        do_pose = do_object = False
+
     # pose
     if do_pose:
         for name, pbone in obj.pose.bones.items():
@@ -368,23 +664,6 @@ def bake_action_iter(
 
     if do_clean:
         for fcu in action.fcurves:
-            fcu_orig_data = clean_orig_data.get(fcu, set())
-
-            keyframe_points = fcu.keyframe_points
-            i = 1
-            while i < len(keyframe_points) - 1:
-                val = keyframe_points[i].co[1]
-
-                if val in fcu_orig_data:
-                    i += 1
-                    continue
-
-                val_prev = keyframe_points[i - 1].co[1]
-                val_next = keyframe_points[i + 1].co[1]
-
-                if abs(val - val_prev) + abs(val - val_next) < 0.0001:
-                    keyframe_points.remove(keyframe_points[i])
-                else:
-                    i += 1
+            _bake_clean_fcurve(fcu, clean_orig_data.get(fcu, set()))
 
     yield action
@@ -149,6 +149,22 @@ def load_image(
                     if filename_check(filename):
                         yield os.path.join(dirpath, filename)
 
+    def _recursive_search_cached(paths, filename_check, filename_lower):
+        # Use 'bpy.path.listdir_cache' when it's in use.
+        for path in paths:
+            files_lower = bpy.path._walk_lower_cached(path)
+            if files_lower is None:
+                yield from _recursive_search((path,), filename_check)
+                continue
+
+            # skip '.svn' (all directories walked start with 'path').
+            if path[0] in {".", b'.'}:
+                continue
+
+            for filepath in files_lower.get(filename_lower, ()):
+                if filename_check(os.path.basename(filepath)):
+                    yield filepath
+
     # -------------------------------------------------------------------------
 
     imagepath = bpy.path.native_pathsep(imagepath)
@@ -198,7 +214,11 @@ def load_image(
             def image_filter(fn):
                 return (imagepath_base == fn)
 
-        nfilepath = next(_recursive_search(search_paths, image_filter), None)
+        nfilepath = next(_recursive_search_cached(
+            search_paths,
+            image_filter,
+            bpy.path.basename(imagepath).lower(),
+        ), None)
         if nfilepath is not None:
             return _image_load(nfilepath)
 
@@ -487,40 +487,166 @@ def path_reference(
         return os.path.basename(filepath_abs)
 
 
-def path_reference_copy(copy_set, report=print):
+def _path_reference_copy_file(file_src, file_dst, st_src):
+    """
+    Copy the file contents, mode and time-stamps,
+    using in-kernel copying where possible.
+
+    :return: the number of bytes copied.
+    """
+    import os
+    import shutil
+    import sys
+
+    # Python 3.8+, 'sendfile' only supports regular files on Linux.
+    copy_file_range = getattr(os, "copy_file_range", None)
+    sendfile = getattr(os, "sendfile", None)
+    if not sys.platform.startswith("linux"):
+        sendfile = None
+
+    size = st_src.st_size
+    offset = 0
+    with open(file_src, 'rb') as fsrc, open(file_dst, 'wb') as fdst:
+        fd_src = fsrc.fileno()
+        fd_dst = fdst.fileno()
+        try:
+            while offset < size and (copy_file_range or sendfile):
+                if copy_file_range is not None:
+                    length = copy_file_range(fd_src, fd_dst, size - offset)
+                else:
+                    length = sendfile(fd_dst, fd_src, offset, size - offset)
+                if length == 0:
+                    break
+                offset += length
+        except OSError:
+            # Not supported for these files (across file-systems for e.g.).
+            pass
+
+        # Copy the remainder (if any).
+        fsrc.seek(offset)
+        fdst.seek(offset)
+        shutil.copyfileobj(fsrc, fdst)
+        offset = fdst.tell()
+
+    shutil.copymode(file_src, file_dst)
+    # Matching time-stamps let the next export skip this file.
+    os.utime(file_dst, ns=(st_src.st_atime_ns, st_src.st_mtime_ns))
+    return offset
+
+
+def path_reference_copy(copy_set, report=print, *, max_workers=None):
     """
     Execute copying files of path_reference
 
+    Files are copied once for each destination,
+    destinations with the same size and modification time as their
+    source are skipped.
+    When different source files have the same destination,
+    only the first (in sorted order) is copied and the conflict is reported.
+
     :arg copy_set: set of (from, to) pairs to copy.
     :type copy_set: set
     :arg report: function used for reporting warnings, takes a string argument.
     :type report: function
+    :arg max_workers: the number of threads used for copying,
+       None to use the :class:`concurrent.futures.ThreadPoolExecutor` default.
+    :type max_workers: int or None
+    :return: a summary with the keys
+       ``"copied"``, ``"skipped"``, ``"missing"``, ``"failed"``,
+       ``"conflicts"`` (file counts) and ``"bytes"``
+       (the number of bytes copied).
+    :rtype: dict
     """
+    summary = {
+        "copied": 0,
+        "skipped": 0,
+        "missing": 0,
+        "failed": 0,
+        "conflicts": 0,
+        "bytes": 0,
+    }
+
     if not copy_set:
-        return
+        return summary
 
     import os
-    import shutil
 
-    for file_src, file_dst in copy_set:
-        if not os.path.exists(file_src):
+    copy_todo = []
+    # {destination: (source, source_stat), ...}
+    copy_dsts = {}
+    dirs_to = set()
+
+    # Sorted, so the file copied is the same for each run on conflicts.
+    for file_src, file_dst in sorted(copy_set):
+        try:
+            st_src = os.stat(file_src)
+        except OSError:
             report("missing %r, not copying" % file_src)
-        elif os.path.exists(file_dst) and os.path.samefile(file_src, file_dst):
-            pass
-        else:
-            dir_to = os.path.dirname(file_dst)
-
-            try:
-                os.makedirs(dir_to, exist_ok=True)
-            except:
-                import traceback
-                traceback.print_exc()
-
-            try:
-                shutil.copy(file_src, file_dst)
-            except:
-                import traceback
-                traceback.print_exc()
+            summary["missing"] += 1
+            continue
+
+        key = os.path.normcase(os.path.abspath(file_dst))
+        file_src_other, st_src_other = copy_dsts.get(key, (None, None))
+        if file_src_other is not None:
+            # The same source file may be referenced by different paths.
+            if os.path.samestat(st_src, st_src_other):
+                summary["skipped"] += 1
+            else:
+                report("conflict, %r and %r are both copied to %r, not copying %r" %
+                       (file_src_other, file_src, file_dst, file_src))
+                summary["conflicts"] += 1
+            continue
+        copy_dsts[key] = file_src, st_src
+
+        try:
+            st_dst = os.stat(file_dst)
+        except OSError:
+            st_dst = None
+
+        if st_dst is not None and (
+                os.path.samestat(st_src, st_dst) or (
+                    st_src.st_size == st_dst.st_size and
+                    st_src.st_mtime_ns == st_dst.st_mtime_ns
+                )
+        ):
+            summary["skipped"] += 1
+            continue
+
+        dirs_to.add(os.path.dirname(file_dst))
+        copy_todo.append((file_src, file_dst, st_src))
+
+    for dir_to in sorted(dirs_to):
+        try:
+            os.makedirs(dir_to, exist_ok=True)
+        except:
+            import traceback
+            traceback.print_exc()
+
+    if not copy_todo:
+        return summary
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    def copy_file(file_src, file_dst, st_src):
+        try:
+            return _path_reference_copy_file(file_src, file_dst, st_src), None
+        except Exception as ex:
+            return 0, ex
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for (file_src, file_dst, _st_src), (size, ex) in zip(
+                copy_todo,
+                executor.map(lambda args: copy_file(*args), copy_todo),
+        ):
+            # Report from the calling thread only.
+            if ex is None:
+                summary["copied"] += 1
+                summary["bytes"] += size
+            else:
+                report("failed to copy %r to %r: %s" % (file_src, file_dst, ex))
+                summary["failed"] += 1
+
+    return summary
 
 
 def unique_name(key, name, name_dict, name_max=-1, clean_func=None, sep="."):
@@ -20,7 +20,9 @@
 
 __all__ = (
     "mesh_linked_uv_islands",
+    "mesh_linked_uv_island_ids",
     "mesh_linked_triangles",
+    "mesh_linked_triangle_ids",
     "edge_face_count_dict",
     "edge_face_count",
     "edge_loops_from_edges",
@@ -29,120 +31,224 @@ __all__ = (
 )
 
 
-def mesh_linked_uv_islands(mesh):
-    """
-    Splits the mesh into connected polygons, use this for separating cubes from
-    other mesh elements within 1 mesh datablock.
+def _disjoint_set_find(parent, i):
+    # Find the root of 'i', halving the path on the way (path compression).
+    p = parent[i]
+    while p != i:
+        pp = parent[p]
+        parent[i] = pp
+        i = p
+        p = pp
+    return i
 
-    :arg mesh: the mesh used to group with.
-    :type mesh: :class:`bpy.types.Mesh`
-    :return: lists of lists containing polygon indices
-    :rtype: list
-    """
-    uv_loops = [luv.uv[:] for luv in mesh.uv_layers.active.data]
-    poly_loops = [poly.loop_indices for poly in mesh.polygons]
-    luv_hash = {}
-    luv_hash_get = luv_hash.get
-    luv_hash_ls = [None] * len(uv_loops)
-    for pi, poly_indices in enumerate(poly_loops):
-        for li in poly_indices:
-            uv = uv_loops[li]
-            uv_hub = luv_hash_get(uv)
-            if uv_hub is None:
-                uv_hub = luv_hash[uv] = [pi]
-            else:
-                uv_hub.append(pi)
-            luv_hash_ls[li] = uv_hub
 
-    poly_islands = []
+def _disjoint_set_union(parent, a, b):
+    # Merge two sets, the lowest index is kept as the root
+    # so the result doesn't depend on the order of unions.
+    a = _disjoint_set_find(parent, a)
+    b = _disjoint_set_find(parent, b)
+    if a < b:
+        parent[b] = a
+    elif b < a:
+        parent[a] = b
 
-    # 0 = none, 1 = added, 2 = searched
-    poly_tag = [0] * len(poly_loops)
 
-    while True:
-        poly_index = -1
-        for i in range(len(poly_loops)):
-            if poly_tag[i] == 0:
-                poly_index = i
-                break
+def _disjoint_set_labels(parent):
+    """
+    Flatten a disjoint-set forest into compact set ids,
+    ordered by the lowest index of each set.
 
-        if poly_index != -1:
-            island = [poly_index]
-            poly_tag[poly_index] = 1
-            poly_islands.append(island)
+    :return: (labels, total) where labels is an array of set ids.
+    """
+    from array import array
+    find = _disjoint_set_find
+    labels = array('i', [-1]) * len(parent)
+    total = 0
+    for i in range(len(parent)):
+        root = find(parent, i)
+        if root == i:
+            labels[i] = total
+            total += 1
         else:
-            break  # we're done
+            # Roots always have the lowest index so they're already labeled.
+            labels[i] = labels[root]
+    return labels, total
 
-        added = True
-        while added:
-            added = False
-            for poly_index in island[:]:
-                if poly_tag[poly_index] == 1:
-                    for li in poly_loops[poly_index]:
-                        for poly_index_shared in luv_hash_ls[li]:
-                            if poly_tag[poly_index_shared] == 0:
-                                added = True
-                                poly_tag[poly_index_shared] = 1
-                                island.append(poly_index_shared)
-                    poly_tag[poly_index] = 2
 
-    return poly_islands
+def _disjoint_set_groups(labels, total):
+    # Expand set ids into lists of indices (each list is sorted).
+    groups = [[] for _ in range(total)]
+    for i, label in enumerate(labels):
+        groups[label].append(i)
+    return groups
 
 
-def mesh_linked_triangles(mesh):
+def mesh_linked_uv_island_ids(mesh, *, uv_layer=None, threshold=0.0):
     """
-    Splits the mesh into connected triangles, use this for separating cubes from
+    Calculate the UV island each polygon belongs to,
+    polygons are connected when they share a UV coordinate.
+
+    This reads the mesh in bulk and runs in near linear time,
+    use it when only the island index of each polygon is needed.
+
+    :arg mesh: the mesh used to group with.
+    :type mesh: :class:`bpy.types.Mesh`
+    :arg uv_layer: the UV layer to use, defaults to the active layer.
+    :type uv_layer: :class:`bpy.types.MeshUVLoopLayer`
+    :arg threshold: UV coordinates closer than this distance
+       are considered connected (zero for an exact match).
+    :type threshold: float
+    :return: (island_ids, island_total) where island_ids is an
+       ``array('i')`` containing the island index of each polygon,
+       islands are numbered by their lowest polygon index.
+    :rtype: tuple
+    """
+    from array import array
+
+    if uv_layer is None:
+        uv_layer = mesh.uv_layers.active
+
+    polygons = mesh.polygons
+    polys_len = len(polygons)
+    loops_len = len(mesh.loops)
+
+    uv_array = array('f', [0.0, 0.0]) * loops_len
+    uv_layer.data.foreach_get("uv", uv_array)
+
+    loop_starts = array('i', [0]) * polys_len
+    loop_totals = array('i', [0]) * polys_len
+    polygons.foreach_get("loop_start", loop_starts)
+    polygons.foreach_get("loop_total", loop_totals)
+
+    parent = array('i', range(polys_len))
+    union = _disjoint_set_union
+
+    if threshold <= 0.0:
+        # Exact match, the first polygon using each UV is its hub.
+        uv_hub = {}
+        uv_hub_setdefault = uv_hub.setdefault
+        for pi in range(polys_len):
+            li_start = loop_starts[pi] * 2
+            for li in range(li_start, li_start + loop_totals[pi] * 2, 2):
+                uv = uv_array[li], uv_array[li + 1]
+                pi_hub = uv_hub_setdefault(uv, pi)
+                if pi_hub != pi:
+                    union(parent, pi_hub, pi)
+    else:
+        # Bin UVs into a grid with cells the size of the threshold,
+        # so only neighboring cells need to be checked.
+        from math import floor
+        threshold_sq = threshold * threshold
+        scale = 1.0 / threshold
+        grid = {}
+        for pi in range(polys_len):
+            li_start = loop_starts[pi] * 2
+            for li in range(li_start, li_start + loop_totals[pi] * 2, 2):
+                u = uv_array[li]
+                v = uv_array[li + 1]
+                cx = floor(u * scale)
+                cy = floor(v * scale)
+                for x in (cx - 1, cx, cx + 1):
+                    for y in (cy - 1, cy, cy + 1):
+                        cell = grid.get((x, y))
+                        if cell is not None:
+                            for u_other, v_other, pi_other in cell:
+                                if (
+                                        pi_other != pi and
+                                        ((u - u_other) ** 2 +
+                                         (v - v_other) ** 2) <= threshold_sq
+                                ):
+                                    union(parent, pi_other, pi)
+                grid.setdefault((cx, cy), []).append((u, v, pi))
+
+    return _disjoint_set_labels(parent)
+
+
+def mesh_linked_uv_islands(mesh, *, uv_layer=None, threshold=0.0):
+    """
+    Splits the mesh into connected polygons, use this for separating cubes from
     other mesh elements within 1 mesh datablock.
 
     :arg mesh: the mesh used to group with.
     :type mesh: :class:`bpy.types.Mesh`
-    :return: lists of lists containing triangles.
+    :arg uv_layer: the UV layer to use, defaults to the active layer.
+    :type uv_layer: :class:`bpy.types.MeshUVLoopLayer`
+    :arg threshold: UV coordinates closer than this distance
+       are considered connected (zero for an exact match).
+    :type threshold: float
+    :return: lists of lists containing polygon indices
     :rtype: list
+
+    .. seealso:: :func:`mesh_linked_uv_island_ids`
+       to avoid creating lists for each island.
     """
+    island_ids, island_total = mesh_linked_uv_island_ids(
+        mesh,
+        uv_layer=uv_layer,
+        threshold=threshold,
+    )
+    return _disjoint_set_groups(island_ids, island_total)
 
-    # Build vert face connectivity
-    vert_tris = [[] for i in range(len(mesh.vertices))]
-    for t in mesh.loop_triangles:
-        for v in t.vertices:
-            vert_tris[v].append(t)
 
-    # sort triangles into connectivity groups
-    tri_groups = [[t] for t in mesh.loop_triangles]
-    # map old, new tri location
-    tri_mapping = list(range(len(mesh.loop_triangles)))
+def mesh_linked_triangle_ids(mesh):
+    """
+    Calculate the connected group each loop triangle belongs to,
+    triangles are connected when they share a vertex.
 
-    # Now clump triangles iteratively
-    ok = True
-    while ok:
-        ok = False
+    This reads the mesh in bulk and runs in near linear time,
+    use it when only the group index of each triangle is needed.
 
-        for t in mesh.loop_triangles:
-            mapped_index = tri_mapping[t.index]
-            mapped_group = tri_groups[mapped_index]
+    :arg mesh: the mesh used to group with.
+    :type mesh: :class:`bpy.types.Mesh`
+    :return: (group_ids, group_total) where group_ids is an
+       ``array('i')`` containing the group index of each loop triangle,
+       groups are numbered by their lowest triangle index.
+    :rtype: tuple
+    """
+    from array import array
+
+    loop_triangles = mesh.loop_triangles
+    tris_len = len(loop_triangles)
 
-            for v in t.vertices:
-                for nxt_t in vert_tris[v]:
-                    if nxt_t != t:
-                        nxt_mapped_index = tri_mapping[nxt_t.index]
+    tri_verts = array('i', [0, 0, 0]) * tris_len
+    loop_triangles.foreach_get("vertices", tri_verts)
 
-                        # We are not a part of the same group
-                        if mapped_index != nxt_mapped_index:
-                            ok = True
+    # The first triangle using each vertex, others are joined to it.
+    vert_tri = array('i', [-1]) * len(mesh.vertices)
 
-                            # Assign mapping to this group so they
-                            # all map to this group
-                            for grp_t in tri_groups[nxt_mapped_index]:
-                                tri_mapping[grp_t.index] = mapped_index
+    parent = array('i', range(tris_len))
+    union = _disjoint_set_union
 
-                            # Move triangles into this group
-                            mapped_group.extend(tri_groups[nxt_mapped_index])
+    for i, v in enumerate(tri_verts):
+        ti = i // 3
+        ti_other = vert_tri[v]
+        if ti_other == -1:
+            vert_tri[v] = ti
+        elif ti_other != ti:
+            union(parent, ti_other, ti)
 
-                            # remove reference to the list
-                            tri_groups[nxt_mapped_index] = None
+    return _disjoint_set_labels(parent)
 
-    # return all tri groups that are not null
-    # this is all the triangles that are connected in their own lists.
-    return [tg for tg in tri_groups if tg]
+
+def mesh_linked_triangles(mesh):
+    """
+    Splits the mesh into connected triangles, use this for separating cubes from
+    other mesh elements within 1 mesh datablock.
+
+    :arg mesh: the mesh used to group with.
+    :type mesh: :class:`bpy.types.Mesh`
+    :return: lists of lists containing triangles.
+    :rtype: list
+
+    .. seealso:: :func:`mesh_linked_triangle_ids`
+       to avoid creating lists for each group.
+    """
+    loop_triangles = mesh.loop_triangles
+    group_ids, group_total = mesh_linked_triangle_ids(mesh)
+    return [
+        [loop_triangles[i] for i in group]
+        for group in _disjoint_set_groups(group_ids, group_total)
+    ]
 
 
 def edge_face_count_dict(mesh):
@@ -151,29 +257,42 @@ def edge_face_count_dict(mesh):
        faces using each edge.
     :rtype: dict
     """
+    from array import array
 
-    face_edge_count = {}
-    loops = mesh.loops
     edges = mesh.edges
-    for poly in mesh.polygons:
-        for i in poly.loop_indices:
-            key = edges[loops[i].edge_index].key
-            try:
-                face_edge_count[key] += 1
-            except:
-                face_edge_count[key] = 1
+    edge_verts = array('i', [0, 0]) * len(edges)
+    edges.foreach_get("vertices", edge_verts)
+
+    face_edge_count = {}
+    face_edge_count_get = face_edge_count.get
+    for i, count in enumerate(edge_face_count(mesh)):
+        if count:
+            v1 = edge_verts[i * 2]
+            v2 = edge_verts[i * 2 + 1]
+            # Match 'MeshEdge.key' which is ordered.
+            key = (v1, v2) if v1 < v2 else (v2, v1)
+            face_edge_count[key] = face_edge_count_get(key, 0) + count
 
     return face_edge_count
 
 
 def edge_face_count(mesh):
     """
-    :return: list face users for each item in mesh.edges.
-    :rtype: list
+    :return: face users for each item in mesh.edges.
+    :rtype: ``array('I')``
     """
-    edge_face_count = edge_face_count_dict(mesh)
-    get = dict.get
-    return [get(edge_face_count, ed.key, 0) for ed in mesh.edges]
+    from array import array
+
+    loops = mesh.loops
+    loop_edges = array('i', [0]) * len(loops)
+    loops.foreach_get("edge_index", loop_edges)
+
+    # Every loop belongs to a face, so count each loop's edge once.
+    edge_face_count = array('I', [0]) * len(mesh.edges)
+    for ei in loop_edges:
+        edge_face_count[ei] += 1
+
+    return edge_face_count
 
 
 def edge_loops_from_edges(mesh, edges=None):
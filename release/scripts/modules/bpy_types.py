@@ -113,19 +113,100 @@ class Collection(bpy_types.ID):
                      if self == obj.instance_collection)
 
 
+class _HierarchyIndex:
+    """
+    Object and bone hierarchy lookups, each built in a single pass
+    when first needed, see: :func:`bpy.utils.hierarchy_index`.
+    """
+    __slots__ = (
+        "users",
+        "_object_children",
+        "_object_collections",
+        "_object_scenes",
+        "_bone_children",
+    )
+
+    def __init__(self):
+        self.users = 0
+        self.clear()
+
+    def clear(self):
+        self._object_children = None
+        self._object_collections = None
+        self._object_scenes = None
+        # (id_data, bone type) -> {parent name: [(index, bone), ...]}.
+        self._bone_children = {}
+
+    def object_children(self, ob):
+        object_children = self._object_children
+        if object_children is None:
+            import bpy
+            object_children = self._object_children = {}
+            for child in bpy.data.objects:
+                parent = child.parent
+                if parent is not None:
+                    object_children.setdefault(parent, []).append(child)
+        return tuple(object_children.get(ob, ()))
+
+    def object_collections(self, ob):
+        object_collections = self._object_collections
+        if object_collections is None:
+            import bpy
+            object_collections = self._object_collections = {}
+            for collection in (
+                    *bpy.data.collections,
+                    *(scene.collection for scene in bpy.data.scenes),
+            ):
+                for ob_iter in collection.objects:
+                    object_collections.setdefault(
+                        ob_iter, []).append(collection)
+        return tuple(object_collections.get(ob, ()))
+
+    def object_scenes(self, ob):
+        object_scenes = self._object_scenes
+        if object_scenes is None:
+            import bpy
+            object_scenes = self._object_scenes = {}
+            for scene in bpy.data.scenes:
+                for ob_iter in scene.objects:
+                    scenes = object_scenes.setdefault(ob_iter, [])
+                    if not (scenes and scenes[-1] == scene):
+                        scenes.append(scene)
+        return tuple(object_scenes.get(ob, ()))
+
+    def bone_children_map(self, bone):
+        key = bone.id_data, type(bone)
+        children_map = self._bone_children.get(key)
+        if children_map is None:
+            children_map = self._bone_children[key] = (
+                bone._children_map_build()
+            )
+        return children_map
+
+
+# Only set while 'bpy.utils.hierarchy_index' is in use.
+_hierarchy_index = None
+
+
 class Object(bpy_types.ID):
     __slots__ = ()
 
     @property
     def children(self):
-        """All the children of this object. Warning: takes O(len(bpy.data.objects)) time."""
+        """All the children of this object. Warning: takes O(len(bpy.data.objects)) time, unless bpy.utils.hierarchy_index is in use."""
+        index = _hierarchy_index
+        if index is not None:
+            return index.object_children(self)
         import bpy
         return tuple(child for child in bpy.data.objects
                      if child.parent == self)
 
     @property
     def users_collection(self):
-        """The collections this object is in. Warning: takes O(len(bpy.data.collections) + len(bpy.data.scenes)) time."""
+        """The collections this object is in. Warning: takes O(len(bpy.data.collections) + len(bpy.data.scenes)) time, unless bpy.utils.hierarchy_index is in use."""
+        index = _hierarchy_index
+        if index is not None:
+            return index.object_collections(self)
         import bpy
         return (
             tuple(
@@ -139,7 +220,10 @@ class Object(bpy_types.ID):
 
     @property
     def users_scene(self):
-        """The scenes this object is in. Warning: takes O(len(bpy.data.scenes) * len(bpy.data.objects)) time."""
+        """The scenes this object is in. Warning: takes O(len(bpy.data.scenes) * len(bpy.data.objects)) time, unless bpy.utils.hierarchy_index is in use."""
+        index = _hierarchy_index
+        if index is not None:
+            return index.object_scenes(self)
         import bpy
         return tuple(scene for scene in bpy.data.scenes
                      if self in scene.objects[:])
@@ -292,20 +376,33 @@ class _GenericBone:
 
     @property
     def children(self):
-        """A list of all the bones children. Warning: takes O(len(bones)) time."""
+        """A list of all the bones children. Warning: takes O(len(bones)) time, unless bpy.utils.hierarchy_index is in use."""
+        index = _hierarchy_index
+        if index is not None:
+            self_type = type(self)
+            return [
+                child
+                for _, child in index.bone_children_map(self).get(self.name, ())
+                if type(child) is self_type
+            ]
         return [child for child in self._other_bones if child.parent == self]
 
     @property
     def children_recursive(self):
-        """A list of all children from this bone. Warning: takes O(len(bones)**2) time."""
+        """A list of all children from this bone. Warning: takes O(len(bones)) time."""
+        children_map = self._children_map()
+
+        # Breadth first, so the bones are sorted by distance to parent.
         bones_children = []
-        for bone in self._other_bones:
-            index = bone.parent_index(self)
-            if index:
-                bones_children.append((index, bone))
+        parents = [self.name]
+        while parents:
+            bones_level = []
+            for name in parents:
+                bones_level.extend(children_map.get(name, ()))
+            bones_level.sort(key=lambda bone_pair: bone_pair[0])
+            bones_children.extend(bones_level)
+            parents = [bone.name for index, bone in bones_level]
 
-        # sort by distance to parent
-        bones_children.sort(key=lambda bone_pair: bone_pair[0])
         return [bone for index, bone in bones_children]
 
     @property
@@ -314,17 +411,17 @@ class _GenericBone:
         Returns a chain of children with the same base name as this bone.
         Only direct chains are supported, forks caused by multiple children
         with matching base names will terminate the function
-        and not be returned. Warning: takes O(len(bones)**2) time.
+        and not be returned. Warning: takes O(len(bones)) time.
         """
+        children_map = self._children_map()
         basename = self.basename
         chain = []
 
         child = self
         while True:
-            children = child.children
             children_basename = []
 
-            for child in children:
+            for _, child in children_map.get(child.name, ()):
                 if basename == child.basename:
                     children_basename.append(child)
 
@@ -341,6 +438,21 @@ class _GenericBone:
 
         return chain
 
+    def _children_map(self):
+        index = _hierarchy_index
+        if index is not None:
+            return index.bone_children_map(self)
+        return self._children_map_build()
+
+    def _children_map_build(self):
+        # Map parent names to (index, bone) pairs of their children.
+        children_map = {}
+        for i, bone in enumerate(self._other_bones):
+            parent = bone.parent
+            if parent is not None:
+                children_map.setdefault(parent.name, []).append((i, bone))
+        return children_map
+
     @property
     def _other_bones(self):
         id_data = self.id_data
@@ -365,6 +477,9 @@ class PoseBone(StructRNA, _GenericBone, metaclass=StructMetaPropGroup):
         pbones = obj.pose.bones
         self_bone = self.bone
 
+        if _hierarchy_index is not None:
+            return tuple(pbones[bone.name] for bone in self_bone.children)
+
         return tuple(pbones[bone.name] for bone in obj.data.bones
                      if bone.parent == self_bone)
 
@@ -38,16 +38,31 @@ changes have been made:
 - sorted modules
 - added sphinx documentation
 - complete() returns a blank list of the module isn't found
+- folders are listed through an index, built in the background and
+  stored between sessions, each folder is checked for changes once
+  per session
 """
 
 
 import os
 import sys
+import threading
 
-TIMEOUT_STORAGE = 3  # Time in secs after which the root-modules will be stored
-TIMEOUT_GIVEUP = 20  # Time in secs after which we give up
+# Index of the modules available in folders,
+# {path: (folder_mtime, modules), ...}, an item is valid as long as the
+# modification time of its folder doesn't change.
+MODULE_INDEX = {}
+MODULE_INDEX_VERSION = 1
+# Time to wait for the index being built when completing (in seconds),
+# after this the folders indexed so far are used.
+MODULE_INDEX_TIMEOUT = 0.25
 
-ROOT_MODULES = None
+_module_index_filepath = None
+_module_index_changed = False
+# Folders of the index checked for changes in this session.
+_module_index_checked = set()
+_module_index_lock = threading.Lock()
+_module_index_thread = None
 
 
 def get_root_modules():
@@ -58,35 +73,31 @@ def get_root_modules():
     :returns: modules
     :rtype: list
     """
-    global ROOT_MODULES
-    modules = []
-    if not(ROOT_MODULES is None):
-        return ROOT_MODULES
-    from time import time
-    t = time()
-    store = False
-    for path in sys.path:
-        modules += module_list(path)
-        if time() - t >= TIMEOUT_STORAGE and not store:
-            # Caching the list of root modules, please wait!
-            store = True
-        if time() - t > TIMEOUT_GIVEUP:
-            # This is taking too long, we give up.
-            ROOT_MODULES = []
-            return []
+    thread = _module_index_thread
+    if thread is not None:
+        # Normally done by the time completion is first used,
+        # otherwise don't stall the interface.
+        thread.join(MODULE_INDEX_TIMEOUT)
+
+    modules = set()
+    if module_index_is_building():
+        # Partial result, only from the folders indexed so far.
+        for path in sys.path:
+            item = MODULE_INDEX.get(os.path.abspath(path))
+            if item is not None:
+                modules.update(item[1])
+    else:
+        for path in sys.path:
+            modules.update(module_list_cached(path))
+        module_index_save()
 
-    modules += sys.builtin_module_names
+    modules.update(sys.builtin_module_names)
 
     # needed for modules defined in C
-    modules += sys.modules.keys()
+    modules.update(sys.modules.keys())
 
-    modules = list(set(modules))
-    if '__init__' in modules:
-        modules.remove('__init__')
-    modules = sorted(modules)
-    if store:
-        ROOT_MODULES = modules
-    return modules
+    modules.discard('__init__')
+    return sorted(modules)
 
 
 def module_list(path):
@@ -121,6 +132,127 @@ def module_list(path):
     return folder_list
 
 
+def module_list_cached(path):
+    """
+    Return the list containing the names of the modules available in
+    the given folder, using the module index when it is up to date.
+    Folders are only checked for changes the first time they're used
+    in a session.
+
+    :param path: folder path
+    :type path: str
+    :returns: modules
+    :rtype: list
+    """
+    global _module_index_changed
+
+    path_abs = os.path.abspath(path)
+    item = MODULE_INDEX.get(path_abs)
+    if path_abs in _module_index_checked:
+        return list(item[1]) if item is not None else []
+    _module_index_checked.add(path_abs)
+
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return []
+
+    if item is None or item[0] != mtime:
+        item = MODULE_INDEX[path_abs] = (mtime, tuple(module_list(path)))
+        _module_index_changed = True
+    return list(item[1])
+
+
+def module_index_load(filepath):
+    """
+    Add the items of a module index stored by :func:`module_index_save`,
+    items already in the index are kept.
+
+    :param filepath: index file path
+    :type filepath: str
+    """
+    import pickle
+
+    try:
+        with open(filepath, 'rb') as f:
+            version, index = pickle.load(f)
+    except Exception:
+        # Missing or invalid index, it will be rebuilt.
+        return
+    if version != MODULE_INDEX_VERSION:
+        return
+    for path, item in index.items():
+        MODULE_INDEX.setdefault(path, item)
+
+
+def module_index_save():
+    """
+    Store the module index when it has changed,
+    if a file path was given to :func:`module_index_build`.
+    """
+    global _module_index_changed
+    import pickle
+
+    filepath = _module_index_filepath
+    if not filepath or not _module_index_changed:
+        return
+
+    with _module_index_lock:
+        _module_index_changed = False
+        index = dict(MODULE_INDEX)
+        filepath_tmp = filepath + ".tmp"
+        try:
+            with open(filepath_tmp, 'wb') as f:
+                pickle.dump((MODULE_INDEX_VERSION, index), f,
+                            pickle.HIGHEST_PROTOCOL)
+            os.replace(filepath_tmp, filepath)
+        except OSError as ex:
+            print("Unable to store the module index %r: %s" % (filepath, ex))
+
+
+def _module_index_build_fn(paths):
+    if _module_index_filepath:
+        module_index_load(_module_index_filepath)
+    for path in paths:
+        module_list_cached(path)
+    module_index_save()
+
+
+def module_index_is_building():
+    """
+    Return True while the module index is being built in the background,
+    see :func:`module_index_build`.
+
+    :rtype: bool
+    """
+    thread = _module_index_thread
+    return thread is not None and thread.is_alive()
+
+
+def module_index_build(filepath=None):
+    """
+    Start building the index of the modules available in the folders of
+    the python-path in a background thread, so listing them doesn't stall
+    completion. Only the first call has an effect.
+
+    :param filepath: optional file path to load and store the index,
+       so folders unchanged since the previous session aren't listed again.
+    :type filepath: str
+    """
+    global _module_index_filepath, _module_index_thread
+
+    if _module_index_thread is not None:
+        return
+
+    _module_index_filepath = filepath
+    _module_index_thread = threading.Thread(
+        target=_module_index_build_fn,
+        args=(list(sys.path),),
+        daemon=True,
+    )
+    _module_index_thread.start()
+
+
 def complete(line):
     """
     Returns a list containing the completion possibilities for an import line.
@@ -166,7 +298,9 @@ def complete(line):
             completion_list = []
         completion_list.extend(getattr(m, '__all__', []))
         if hasattr(m, '__file__') and '__init__' in m.__file__:
-            completion_list.extend(module_list(os.path.dirname(m.__file__)))
+            completion_list.extend(
+                module_list_cached(os.path.dirname(m.__file__)))
+            module_index_save()
         completion_list = list(set(completion_list))
         if '__init__' in completion_list:
             completion_list.remove('__init__')
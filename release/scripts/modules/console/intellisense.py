@@ -146,6 +146,12 @@ def expand(line, cursor, namespace, private=True):
 
         no_calltip = True
 
+        if RE_MODULE.match(line):
+            from . import complete_import
+            if complete_import.module_index_is_building():
+                note = "    (indexing modules, the list may be incomplete)"
+                scrollback = (scrollback + "\n" + note) if scrollback else note
+
     if prefix:
         line = line[:cursor] + prefix + line[cursor:]
         cursor += len(prefix.encode('utf-8'))
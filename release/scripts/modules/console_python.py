@@ -17,6 +17,7 @@
 # ##### END GPL LICENSE BLOCK #####
 
 # <pep8-80 compliant>
+import os
 import sys
 import bpy
 
@@ -109,6 +110,9 @@ def get_console(console_id):
         console.push("from mathutils import *")
         console.push("from math import *")
 
+        # list modules for import completion in the background.
+        module_index_build()
+
         if _BPY_MAIN_OWN:
             console._bpy_main_mod = bpy_main_mod
 
@@ -121,6 +125,17 @@ def get_console(console_id):
     return console, stdout, stderr
 
 
+def module_index_build():
+    from console import complete_import
+
+    config_dir = bpy.utils.user_resource('CONFIG')
+    if config_dir and os.path.isdir(config_dir):
+        filepath = os.path.join(config_dir, "console_module_index.pickle")
+    else:
+        filepath = None
+    complete_import.module_index_build(filepath)
+
+
 # Both prompts must be the same length
 PROMPT = '>>> '
 PROMPT_MULTI = '... '
@@ -0,0 +1,414 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+# Packing for the lightmap pack operator (see: 'bl_operators.uvcalc_lightmap').
+# This module doesn't depend on 'bpy' so it can be used from worker processes.
+
+__all__ = (
+    "pack_group",
+)
+
+
+class prettyface:
+    __slots__ = (
+        "uv",
+        "width",
+        "height",
+        "children",
+        "xoff",
+        "yoff",
+        "has_parent",
+        "rot",
+    )
+
+    def __init__(self, data):
+        self.has_parent = False
+        self.rot = False  # only used for triangles
+        self.xoff = 0
+        self.yoff = 0
+
+        if type(data) == list:  # list of data
+            self.uv = None
+
+            # join the data
+            if len(data) == 2:
+                # 2 vertical blocks
+                data[1].xoff = data[0].width
+                self.width = data[0].width * 2
+                self.height = data[0].height
+
+            elif len(data) == 4:
+                # 4 blocks all the same size
+                d = data[0].width  # dimension x/y are the same
+
+                data[1].xoff += d
+                data[2].yoff += d
+
+                data[3].xoff += d
+                data[3].yoff += d
+
+                self.width = self.height = d * 2
+
+            # else:
+            #     print(len(data), data)
+            #     raise "Error"
+
+            for pf in data:
+                pf.has_parent = True
+
+            self.children = data
+
+        elif len(data) == 2:
+            # 2 triangles, see: _lightmap_faces_extract
+            # (loops, lens, lens_order, angle_order)
+            self.uv = data
+
+            _loops1, lens1, lens1ord, _angles1 = data[0]
+            if data[1]:
+                _loops2, lens2, lens2ord, _angles2 = data[1]
+                self.width = (lens1[lens1ord[0]] + lens2[lens2ord[0]]) / 2.0
+                self.height = (lens1[lens1ord[1]] + lens2[lens2ord[1]]) / 2.0
+            else:  # 1 tri :/
+                self.width = lens1[0]
+                self.height = lens1[1]
+
+            self.children = []
+
+        else:  # quad or ngon, see: _lightmap_faces_extract
+            self.uv, self.width, self.height = data
+            self.children = []
+
+    def spin(self):
+        if self.uv and len(self.uv) == 4:
+            self.uv = self.uv[1], self.uv[2], self.uv[3], self.uv[0]
+
+        self.width, self.height = self.height, self.width
+        self.xoff, self.yoff = self.yoff, self.xoff  # not needed?
+        self.rot = not self.rot  # only for tri pairs and ngons.
+        # print("spinning")
+        for pf in self.children:
+            pf.spin()
+
+    def place(self, xoff, yoff, xfac, yfac, margin_w, margin_h, uv_out):
+        xoff += self.xoff
+        yoff += self.yoff
+
+        for pf in self.children:
+            pf.place(xoff, yoff, xfac, yfac, margin_w, margin_h, uv_out)
+
+        uv = self.uv
+        if not uv:
+            return
+
+        x1 = xoff
+        y1 = yoff
+        x2 = xoff + self.width
+        y2 = yoff + self.height
+
+        # Scale the values
+        x1 = x1 / xfac + margin_w
+        x2 = x2 / xfac - margin_w
+        y1 = y1 / yfac + margin_h
+        y2 = y2 / yfac - margin_h
+
+        # 2 Tri pairs
+        if len(uv) == 2:
+            # match the order of angle sizes of the 3d verts with the UV angles and rotate.
+            def set_uv(tri, p1, p2, p3):
+                loops, _lens, _lens_order, I = tri
+
+                if self.rot:
+                    uv_out[loops[I[2]]] = p1
+                    uv_out[loops[I[1]]] = p2
+                    uv_out[loops[I[0]]] = p3
+                else:
+                    uv_out[loops[I[2]]] = p1
+                    uv_out[loops[I[0]]] = p2
+                    uv_out[loops[I[1]]] = p3
+
+            set_uv(uv[0], (x1, y1), (x1, y2 - margin_h), (x2 - margin_w, y1))
+
+            if uv[1]:
+                set_uv(uv[1], (x2, y2), (x2, y1 + margin_h), (x1 + margin_w, y2))
+
+        else:  # 1 QUAD
+            if len(uv) == 4:
+                uv_out[uv[1]] = x1, y1
+                uv_out[uv[2]] = x1, y2
+                uv_out[uv[3]] = x2, y2
+                uv_out[uv[0]] = x2, y1
+            else:
+                # NGon
+                xspan = x2 - x1
+                yspan = y2 - y1
+                for li, x, y in uv:
+                    uv_out[li] = ((x1 + (x * xspan)),
+                                  (y1 + (y * yspan)))
+
+    def __hash__(self):
+        # None unique hash
+        return self.width, self.height
+
+
+def pack_group(faces, areas, PREF_BOX_DIV, PREF_MARGIN_DIV):
+    """
+    Pack one group of faces, extracted by the lightmap pack operator.
+
+    Only plain data is used, so this can run in a worker process.
+
+    :return: packed UV's, keyed by loop index.
+    :rtype: dict
+    """
+    from math import sqrt
+    from mathutils.geometry import box_pack_2d
+
+    print("\nStarting unwrap")
+
+    pretty_faces = [prettyface(f) for f in faces if len(f) == 3]
+
+    # Do we have any triangles?
+    if len(pretty_faces) != len(faces):
+
+        # Now add triangles, not so simple because we need to pair them up.
+        tri_lengths = [f for f in faces if len(f) == 4]
+
+        def trilensdiff(t1, t2):
+            return (abs(t1[1][t1[2][0]] - t2[1][t2[2][0]]) +
+                    abs(t1[1][t1[2][1]] - t2[1][t2[2][1]]) +
+                    abs(t1[1][t1[2][2]] - t2[1][t2[2][2]]))
+
+        while tri_lengths:
+            tri1 = tri_lengths.pop()
+
+            if not tri_lengths:
+                pretty_faces.append(prettyface((tri1, None)))
+                break
+
+            best_tri_index = -1
+            best_tri_diff = 100000000.0
+
+            for i, tri2 in enumerate(tri_lengths):
+                diff = trilensdiff(tri1, tri2)
+                if diff < best_tri_diff:
+                    best_tri_index = i
+                    best_tri_diff = diff
+
+            pretty_faces.append(prettyface((tri1, tri_lengths.pop(best_tri_index))))
+
+    # Get the min, max and total areas
+    max_area = 0.0
+    min_area = 100000000.0
+    tot_area = 0
+    for area in areas:
+        if area > max_area:
+            max_area = area
+        if area < min_area:
+            min_area = area
+        tot_area += area
+
+    max_len = sqrt(max_area)
+    min_len = sqrt(min_area)
+    side_len = sqrt(tot_area)
+
+    # Build widths
+
+    curr_len = max_len
+
+    print("\tGenerating lengths...", end="")
+
+    lengths = []
+    while curr_len > min_len:
+        lengths.append(curr_len)
+        curr_len = curr_len / 2.0
+
+        # Don't allow boxes smaller then the margin
+        # since we contract on the margin, boxes that are smaller will create errors
+        # print(curr_len, side_len/MARGIN_DIV)
+        if curr_len / 4.0 < side_len / PREF_MARGIN_DIV:
+            break
+
+    if not lengths:
+        lengths.append(curr_len)
+
+    # convert into ints
+    lengths_to_ints = {}
+
+    l_int = 1
+    for l in reversed(lengths):
+        lengths_to_ints[l] = l_int
+        l_int *= 2
+
+    lengths_to_ints = list(lengths_to_ints.items())
+    lengths_to_ints.sort()
+    print("done")
+
+    # apply quantized values.
+
+    for pf in pretty_faces:
+        w = pf.width
+        h = pf.height
+        bestw_diff = 1000000000.0
+        besth_diff = 1000000000.0
+        new_w = 0.0
+        new_h = 0.0
+        for l, i in lengths_to_ints:
+            d = abs(l - w)
+            if d < bestw_diff:
+                bestw_diff = d
+                new_w = i  # assign the int version
+
+            d = abs(l - h)
+            if d < besth_diff:
+                besth_diff = d
+                new_h = i  # ditto
+
+        pf.width = new_w
+        pf.height = new_h
+
+        if new_w > new_h:
+            pf.spin()
+
+    print("...done")
+
+    # Since the boxes are sized in powers of 2, we can neatly group them into bigger squares
+    # this is done hierarchically, so that we may avoid running the pack function
+    # on many thousands of boxes, (under 1k is best) because it would get slow.
+    # Using an off and even dict us useful because they are packed differently
+    # where w/h are the same, their packed in groups of 4
+    # where they are different they are packed in pairs
+    #
+    # After this is done an external pack func is done that packs the whole group.
+
+    print("\tConsolidating Boxes...", end="")
+    even_dict = {}  # w/h are the same, the key is an int (w)
+    odd_dict = {}  # w/h are different, the key is the (w,h)
+
+    for pf in pretty_faces:
+        w, h = pf.width, pf.height
+        if w == h:
+            even_dict.setdefault(w, []).append(pf)
+        else:
+            odd_dict.setdefault((w, h), []).append(pf)
+
+    # Count the number of boxes consolidated, only used for stats.
+    c = 0
+
+    # This is tricky. the total area of all packed boxes, then sqrt() that to get an estimated size
+    # this is used then converted into out INT space so we can compare it with
+    # the ints assigned to the boxes size
+    # and divided by BOX_DIV, basically if BOX_DIV is 8
+    # ...then the maximum box consolidation (recursive grouping) will have a max width & height
+    # ...1/8th of the UV size.
+    # ...limiting this is needed or you end up with bug unused texture spaces
+    # ...however if its too high, box-packing is way too slow for high poly meshes.
+    float_to_int_factor = lengths_to_ints[0][0]
+    if float_to_int_factor > 0:
+        max_int_dimension = int(((side_len / float_to_int_factor)) / PREF_BOX_DIV)
+        ok = True
+    else:
+        max_int_dimension = 0.0  # won't be used
+        ok = False
+
+    # RECURSIVE pretty face grouping
+    while ok:
+        ok = False
+
+        # Tall boxes in groups of 2
+        for d, boxes in list(odd_dict.items()):
+            if d[1] < max_int_dimension:
+                # boxes.sort(key=lambda a: len(a.children))
+                while len(boxes) >= 2:
+                    # print("foo", len(boxes))
+                    ok = True
+                    c += 1
+                    pf_parent = prettyface([boxes.pop(), boxes.pop()])
+                    pretty_faces.append(pf_parent)
+
+                    w, h = pf_parent.width, pf_parent.height
+                    assert(w <= h)
+
+                    if w == h:
+                        even_dict.setdefault(w, []).append(pf_parent)
+                    else:
+                        odd_dict.setdefault((w, h), []).append(pf_parent)
+
+        # Even boxes in groups of 4
+        for d, boxes in list(even_dict.items()):
+            if d < max_int_dimension:
+                boxes.sort(key=lambda a: len(a.children))
+
+                while len(boxes) >= 4:
+                    # print("bar", len(boxes))
+                    ok = True
+                    c += 1
+
+                    pf_parent = prettyface([boxes.pop(), boxes.pop(), boxes.pop(), boxes.pop()])
+                    pretty_faces.append(pf_parent)
+                    w = pf_parent.width  # width and weight are the same
+                    even_dict.setdefault(w, []).append(pf_parent)
+
+    del even_dict
+    del odd_dict
+
+    # orig = len(pretty_faces)
+
+    pretty_faces = [pf for pf in pretty_faces if not pf.has_parent]
+
+    # spin every second pretty-face
+    # if there all vertical you get less efficiently used texture space
+    i = len(pretty_faces)
+    d = 0
+    while i:
+        i -= 1
+        pf = pretty_faces[i]
+        if pf.width != pf.height:
+            d += 1
+            if d % 2:  # only pack every second
+                pf.spin()
+                # pass
+
+    print("Consolidated", c, "boxes, done")
+    # print("done", orig, len(pretty_faces))
+
+    # boxes2Pack.append([islandIdx, w,h])
+    print("\tPacking Boxes", len(pretty_faces), end="...")
+    boxes2Pack = [[0.0, 0.0, pf.width, pf.height, i] for i, pf in enumerate(pretty_faces)]
+    packWidth, packHeight = box_pack_2d(boxes2Pack)
+
+    # print(packWidth, packHeight)
+
+    packWidth = float(packWidth)
+    packHeight = float(packHeight)
+
+    margin_w = ((packWidth) / PREF_MARGIN_DIV) / packWidth
+    margin_h = ((packHeight) / PREF_MARGIN_DIV) / packHeight
+
+    # print(margin_w, margin_h)
+    print("done")
+
+    # Apply the boxes back to the UV coords.
+    print("\twriting back UVs", end="")
+    uv_out = {}
+    for i, box in enumerate(boxes2Pack):
+        pretty_faces[i].place(box[0], box[1], packWidth, packHeight, margin_w, margin_h, uv_out)
+        # pf.place(box[1][1], box[1][2], packWidth, packHeight, margin_w, margin_h)
+    print("done")
+
+    return uv_out
@@ -569,7 +569,8 @@ class PREFERENCES_OT_addon_refresh(Operator):
     def execute(self, _context):
         import addon_utils
 
-        addon_utils.modules_refresh()
+        # Reads every add-on's 'bl_info', which is slow on network drives.
+        addon_utils.modules_refresh(use_threads=True)
 
         return {'FINISHED'}
 
@@ -652,7 +653,7 @@ class PREFERENCES_OT_addon_install(Operator):
         del pyfile_dir
         # done checking for exceptional case
 
-        addons_old = {mod.__name__ for mod in addon_utils.modules()}
+        addons_old = {mod.__name__ for mod in addon_utils.modules(use_threads=True)}
 
         # check to see if the file is in compressed format (.zip)
         if zipfile.is_zipfile(pyfile):
@@ -694,7 +695,7 @@ class PREFERENCES_OT_addon_install(Operator):
                 traceback.print_exc()
                 return {'CANCELLED'}
 
-        addons_new = {mod.__name__ for mod in addon_utils.modules()} - addons_old
+        addons_new = {mod.__name__ for mod in addon_utils.modules(use_threads=True)} - addons_old
         addons_new.discard("modules")
 
         # disable any addons we may have enabled previously and removed.
@@ -708,7 +709,9 @@ class PREFERENCES_OT_addon_install(Operator):
             if mod.__name__ in addons_new:
                 info = addon_utils.module_bl_info(mod)
 
-                # show the newly installed addon.
+                # show the newly installed addon,
+                # (the add-on filter properties are defined by the interface).
+                bpy.utils.register_ui_deferred()
                 context.preferences.view.show_addons_enabled_only = False
                 context.window_manager.addon_filter = 'All'
                 context.window_manager.addon_search = info["name"]
@@ -776,7 +779,7 @@ class PREFERENCES_OT_addon_remove(Operator):
         else:
             os.remove(path)
 
-        addon_utils.modules_refresh()
+        addon_utils.modules_refresh(use_threads=True)
 
         context.area.tag_redraw()
         return {'FINISHED'}
@@ -838,6 +841,9 @@ class PREFERENCES_OT_addon_show(Operator):
             info = addon_utils.module_bl_info(mod)
             info["show_expanded"] = True
 
+            # Defines the add-on filter properties.
+            bpy.utils.register_ui_deferred()
+
             context.preferences.active_section = 'ADDONS'
             context.preferences.view.show_addons_enabled_only = False
             context.window_manager.addon_filter = 'All'
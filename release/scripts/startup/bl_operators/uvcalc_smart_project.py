@@ -94,23 +94,10 @@ def pointInTri2D(v, v1, v2, v3):
 
 
 def boundsIsland(faces):
-    minx = maxx = faces[0].uv[0][0]  # Set initial bounds.
-    miny = maxy = faces[0].uv[0][1]
-    # print len(faces), minx, maxx, miny , maxy
-    for f in faces:
-        for uv in f.uv:
-            x = uv.x
-            y = uv.y
-            if x < minx:
-                minx = x
-            if y < miny:
-                miny = y
-            if x > maxx:
-                maxx = x
-            if y > maxy:
-                maxy = y
-
-    return minx, miny, maxx, maxy
+    # Flatten the coordinates so min/max run over whole arrays.
+    uv_x = [uv.x for f in faces for uv in f.uv]
+    uv_y = [uv.y for f in faces for uv in f.uv]
+    return min(uv_x), min(uv_y), max(uv_x), max(uv_y)
 
 
 """
@@ -148,7 +135,7 @@ def island2Edge(island):
         for vIdx in range(len(f_uvkey)):
             unique_points[f_uvkey[vIdx]] = f.uv[vIdx]
 
-            if f.v[vIdx].index > f.v[vIdx - 1].index:
+            if f.v[vIdx] > f.v[vIdx - 1]:
                 i1 = vIdx - 1
                 i2 = vIdx
             else:
@@ -571,6 +558,13 @@ def getUvIslands(faceGroups, me):
 
 
 def packIslands(islandList):
+    """
+    Pack islands into the UV bounds.
+
+    :return: a list of (xoffset, yoffset, xfactor, yfactor) transforms
+       aligned with islandList, the UV's are written by applying these
+       (see islandsWriteUvs).
+    """
     if USER_FILL_HOLES:
         # XXX  Window.DrawProgressBar(0.1, 'Merging Islands (Ctrl: skip merge)...')
         mergeUvIslands(islandList)  # Modify in place
@@ -647,17 +641,27 @@ def packIslands(islandList):
             # Keep proportions.
             xfactor = yfactor = 1.0 / max(packWidth, packHeight)
 
-    while islandIdx:
-        islandIdx -= 1
-        # Write the packed values to the UV's
+    # The packed values are written to the UV's later, in one pass.
+    return [
+        (
+            packBox[0] - islandOffset[0],
+            packBox[1] - islandOffset[1],
+            xfactor,
+            yfactor,
+        )
+        for packBox, islandOffset in zip(packBoxes, islandOffsetList)
+    ]
 
-        xoffset = packBoxes[islandIdx][0] - islandOffsetList[islandIdx][0]
-        yoffset = packBoxes[islandIdx][1] - islandOffsetList[islandIdx][1]
 
-        for f in islandList[islandIdx]:  # Offsetting the UV's so they fit in there packed box
-            for uv in f.uv:
-                uv.x = (uv.x + xoffset) * xfactor
-                uv.y = (uv.y + yoffset) * yfactor
+def islandsWriteUvs(islandList, islandTransforms):
+    # Offset the UV's so they fit in their packed box,
+    # writing into each mesh's flat UV array.
+    for island, (xoffset, yoffset, xfactor, yfactor) in zip(islandList, islandTransforms):
+        for f in island:
+            uv_array = f.uv_array
+            for li, uv in zip(f.loop_indices, f.uv):
+                uv_array[li * 2] = (uv.x + xoffset) * xfactor
+                uv_array[li * 2 + 1] = (uv.y + yoffset) * yfactor
 
 
 def VectoQuat(vec):
@@ -666,15 +670,71 @@ def VectoQuat(vec):
 
 
 class thickface:
-    __slost__ = "v", "uv", "no", "area", "edge_keys"
+    __slots__ = "v", "uv", "no", "area", "edge_keys", "loop_indices", "uv_array"
+
+    def __init__(self, v, loop_indices, no, area, uv_array):
+        # Vertex indices.
+        self.v = v
+        # UV's are calculated detached from the mesh,
+        # 'uv_array' is the flat array of the mesh's UV's they're written to.
+        self.uv = [Vector((0.0, 0.0)) for _ in v]
+        self.loop_indices = loop_indices
+        self.uv_array = uv_array
+
+        self.no = no
+        self.area = area
+        self.edge_keys = [
+            (v1, v2) if v1 < v2 else (v2, v1)
+            for v1, v2 in zip(v, v[1:] + v[:1])
+        ]
+
 
-    def __init__(self, face, uv_layer, mesh_verts):
-        self.v = [mesh_verts[i] for i in face.vertices]
-        self.uv = [uv_layer[i].uv for i in face.loop_indices]
+def mesh_thickfaces(me, uv_array, only_selected):
+    """
+    Create thick faces, reading mesh data in bulk.
 
-        self.no = face.normal.copy()
-        self.area = face.area
-        self.edge_keys = face.edge_keys
+    :return: thick faces and vertex coordinates.
+    """
+    from array import array
+
+    polygons = me.polygons
+    polys_len = len(polygons)
+
+    poly_normals = array('f', [0.0, 0.0, 0.0]) * polys_len
+    poly_areas = array('f', [0.0]) * polys_len
+    poly_loop_starts = array('i', [0]) * polys_len
+    poly_loop_totals = array('i', [0]) * polys_len
+    polygons.foreach_get("normal", poly_normals)
+    polygons.foreach_get("area", poly_areas)
+    polygons.foreach_get("loop_start", poly_loop_starts)
+    polygons.foreach_get("loop_total", poly_loop_totals)
+
+    if only_selected:
+        poly_select = array('b', [False]) * polys_len
+        polygons.foreach_get("select", poly_select)
+        poly_indices = [i for i in range(polys_len) if poly_select[i]]
+    else:
+        poly_indices = range(polys_len)
+
+    loop_verts = array('i', [0]) * len(me.loops)
+    me.loops.foreach_get("vertex_index", loop_verts)
+
+    vert_coords = array('f', [0.0, 0.0, 0.0]) * len(me.vertices)
+    me.vertices.foreach_get("co", vert_coords)
+    vert_coords = [Vector(vert_coords[i:i + 3]) for i in range(0, len(vert_coords), 3)]
+
+    faces = []
+    for i in poly_indices:
+        loop_start = poly_loop_starts[i]
+        loop_indices = range(loop_start, loop_start + poly_loop_totals[i])
+        faces.append(thickface(
+            loop_verts[loop_start:loop_indices.stop].tolist(),
+            loop_indices,
+            Vector(poly_normals[i * 3:i * 3 + 3]),
+            poly_areas[i],
+            uv_array,
+        ))
+    return faces, vert_coords
 
 
 def main_consts():
@@ -715,6 +775,7 @@ def main(context,
     global USER_ISLAND_MARGIN
 
     from math import cos
+    from array import array
     import time
 
     global dict_matrix
@@ -769,6 +830,9 @@ def main(context,
 
     time1 = time.time()
 
+    # (mesh, uv_array) pairs, written back once packing is done.
+    mesh_uv_arrays = []
+
     # Tag as False so we don't operate on the same mesh twice.
     for me in bpy.data.meshes:
         me.tag = False
@@ -785,13 +849,12 @@ def main(context,
         if not me.uv_layers:  # Mesh has no UV Coords, don't bother.
             me.uv_layers.new()
 
-        uv_layer = me.uv_layers.active.data
-        me_verts = list(me.vertices)
+        # Keep the existing UV's of faces which aren't projected.
+        uv_array = array('f', [0.0, 0.0]) * len(me.loops)
+        me.uv_layers.active.data.foreach_get("uv", uv_array)
+        mesh_uv_arrays.append((me, uv_array))
 
-        if USER_ONLY_SELECTED_FACES:
-            meshFaces = [thickface(f, uv_layer, me_verts) for i, f in enumerate(me.polygons) if f.select]
-        else:
-            meshFaces = [thickface(f, uv_layer, me_verts) for i, f in enumerate(me.polygons)]
+        meshFaces, me_coords = mesh_thickfaces(me, uv_array, USER_ONLY_SELECTED_FACES)
 
         # =======
         # Generate a projection list from face normals, this is meant to be smart :)
@@ -806,8 +869,8 @@ def main(context,
         # remove all zero area faces
         while meshFaces and meshFaces[-1].area <= SMALL_NUM:
             # Set their UV's to 0,0
-            for uv in meshFaces[-1].uv:
-                uv.zero()
+            for li in meshFaces[-1].loop_indices:
+                uv_array[li * 2] = uv_array[li * 2 + 1] = 0.0
             meshFaces.pop()
 
         if not meshFaces:
@@ -941,7 +1004,7 @@ def main(context,
             for f in faceProjectionGroupList[i]:
                 f_uv = f.uv
                 for j, v in enumerate(f.v):
-                    f_uv[j][:] = (MatQuat @ v.co).xy
+                    f_uv[j][:] = (MatQuat @ me_coords[v]).xy
 
         if USER_SHARE_SPACE:
             # Should we collect and pack later?
@@ -951,13 +1014,16 @@ def main(context,
         else:
             # Should we pack the islands for this 1 object?
             islandList = getUvIslands(faceProjectionGroupList, me)
-            packIslands(islandList)
+            islandsWriteUvs(islandList, packIslands(islandList))
 
         # update the mesh here if we need to.
 
     # We want to pack all in 1 go, so pack now
     if USER_SHARE_SPACE:
-        packIslands(collected_islandList)
+        islandsWriteUvs(collected_islandList, packIslands(collected_islandList))
+
+    for me, uv_array in mesh_uv_arrays:
+        me.uv_layers.active.data.foreach_set("uv", uv_array)
 
     print("Smart Projection time: %.2f" % (time.time() - time1))
 
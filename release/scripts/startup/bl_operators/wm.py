@@ -974,8 +974,13 @@ class WM_OT_path_open(Operator):
 def _wm_doc_get_id(doc_id, do_url=True, url_prefix=""):
 
     def operator_exists_pair(a, b):
-        # Not fast, this is only for docs.
-        return b in dir(getattr(bpy.ops, a))
+        # Direct lookup in the operator types registry,
+        # rather than listing all operators of the sub-module.
+        try:
+            getattr(getattr(bpy.ops, a), b).get_rna_type()
+        except KeyError:
+            return False
+        return True
 
     def operator_exists_single(a):
         a, b = a.partition("_OT_")[::2]
@@ -1043,6 +1048,88 @@ def _wm_doc_get_id(doc_id, do_url=True, url_prefix=""):
     return url if do_url else rna
 
 
+class _ManualURLIndex:
+    """
+    Lookup structure for the (pattern, url_suffix) items of a manual mapping,
+    giving the same result as matching the RNA ID against each pattern in turn
+    with fnmatchcase (the first matching pattern wins).
+    """
+    __slots__ = (
+        "exact",
+        "prefix_trie",
+        "patterns",
+    )
+
+    def __init__(self, url_mapping):
+        import re
+        from fnmatch import translate
+
+        # Items are (index, pattern, url_suffix), index being the position
+        # of the pattern in the mapping.
+        self.exact = {}
+        self.prefix_trie = {}
+        # Other patterns (with wildcards not only at their end), in order.
+        self.patterns = []
+
+        for i, (pattern, url_suffix) in enumerate(url_mapping):
+            item = (i, pattern, url_suffix)
+            is_prefix = pattern.endswith("*")
+            pattern_base = pattern[:-1] if is_prefix else pattern
+            if "*" in pattern_base or "?" in pattern_base or "[" in pattern_base:
+                self.patterns.append((re.compile(translate(pattern)).match, item))
+            elif is_prefix:
+                node = self.prefix_trie
+                for c in pattern_base:
+                    node = node.setdefault(c, {})
+                # The None key stores the item of the prefix ending at this node.
+                node.setdefault(None, item)
+            else:
+                self.exact.setdefault(pattern, item)
+
+    def find(self, rna_id):
+        best = self.exact.get(rna_id)
+
+        # All prefix patterns matching are on the path of the ID in the trie.
+        node = self.prefix_trie
+        for c in rna_id:
+            item = node.get(None)
+            if item is not None and (best is None or item[0] < best[0]):
+                best = item
+            node = node.get(c)
+            if node is None:
+                break
+        else:
+            item = node.get(None)
+            if item is not None and (best is None or item[0] < best[0]):
+                best = item
+
+        for match, item in self.patterns:
+            if best is not None and item[0] > best[0]:
+                break
+            if match(rna_id):
+                best = item
+                break
+
+        return best
+
+
+# Indices of the url mappings, {id(url_mapping): (url_mapping, index), ...}.
+_manual_url_indices = {}
+
+
+def _manual_url_index_get(url_mapping):
+    # Keep a reference to the mapping, so that its ID is never re-used.
+    url_mapping_index = _manual_url_indices.get(id(url_mapping))
+    if url_mapping_index is None or url_mapping_index[0] is not url_mapping:
+        # Mappings returned by bpy.utils.manual_map() callbacks should be
+        # persistent, still, avoid growing forever if they are not.
+        if len(_manual_url_indices) > 16:
+            _manual_url_indices.clear()
+        url_mapping_index = url_mapping, _ManualURLIndex(url_mapping)
+        _manual_url_indices[id(url_mapping)] = url_mapping_index
+    return url_mapping_index[1]
+
+
 class WM_OT_doc_view_manual(Operator):
     """Load online manual"""
     bl_idname = "wm.doc_view_manual"
@@ -1054,15 +1141,15 @@ class WM_OT_doc_view_manual(Operator):
     def _find_reference(rna_id, url_mapping, verbose=True):
         if verbose:
             print("online manual check for: '%s'... " % rna_id)
-        from fnmatch import fnmatchcase
         # XXX, for some reason all RNA ID's are stored lowercase
         # Adding case into all ID's isn't worth the hassle so force lowercase.
         rna_id = rna_id.lower()
-        for pattern, url_suffix in url_mapping:
-            if fnmatchcase(rna_id, pattern):
-                if verbose:
-                    print("            match found: '%s' --> '%s'" % (pattern, url_suffix))
-                return url_suffix
+        item = _manual_url_index_get(url_mapping).find(rna_id)
+        if item is not None:
+            _i, pattern, url_suffix = item
+            if verbose:
+                print("            match found: '%s' --> '%s'" % (pattern, url_suffix))
+            return url_suffix
         if verbose:
             print("match not found")
         return None
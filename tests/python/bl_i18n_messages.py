@@ -0,0 +1,157 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --python tests/python/bl_i18n_messages.py -- --verbose
+import unittest
+
+
+def random_msgids(rng, count):
+    # Messages made of a small vocabulary, so many of them are similar.
+    words = (
+        "Add", "Remove", "Select", "Object", "Mesh", "Vertex", "Vertices", "Edge", "Face",
+        "Active", "All", "None", "Mode", "Edit", "Settings", "Use", "the", "of", "to",
+    )
+    msgids = []
+    for _ in range(count):
+        msgids.append(" ".join(rng.choice(words) for _ in range(rng.randint(1, 6))))
+    # Duplicates, the last matching msgid of the pool wins on ties.
+    msgids.extend(rng.sample(msgids, count // 10))
+    return msgids
+
+
+PO_TEST = r'''
+msgid ""
+msgstr ""
+"Project-Id-Version: test\n"
+"MIME-Version: 1.0\n"
+"Content-Type: text/plain; charset=UTF-8\n"
+"Content-Transfer-Encoding: 8bit\n"
+
+msgid "Vertex"
+msgstr "Sommet"
+
+msgctxt "Operator"
+msgid "Vertex"
+msgstr "Sommet (opérateur)"
+
+msgctxt "ID"
+msgid "Vertex"
+msgstr "Sommet (ID)"
+
+msgid "Line\nbreak and \"quotes\""
+msgstr "Retour\nà la ligne et \"guillemets\""
+
+msgid "Mesh"
+msgstr "Maillage"
+
+#, fuzzy
+msgid "Fuzzy"
+msgstr "Flou"
+
+msgid "Untranslated"
+msgstr ""
+'''
+
+
+def mo_hash_lookup(data, key):
+    # Find 'key' using the hash table of mo file 'data', as gettext does,
+    # returning the index of the string or -1.
+    import struct
+    _magic, _revision, _N, O, _T, S, H = struct.unpack_from("<7I", data)
+    hval = 0
+    for c in key:
+        hval = ((hval << 4) + c) & 0xffffffff
+        g = hval & 0xf0000000
+        if g:
+            hval ^= g >> 24
+            hval ^= g
+    idx = hval % S
+    incr = 1 + (hval % (S - 2))
+    while True:
+        nstr = struct.unpack_from("<I", data, H + idx * 4)[0]
+        if nstr == 0:
+            return -1
+        length, offset = struct.unpack_from("<2I", data, O + (nstr - 1) * 8)
+        if data[offset:offset + length] == key:
+            return nstr - 1
+        idx = (idx - (S - incr)) if idx >= S - incr else (idx + incr)
+
+
+class TestMoWriter(unittest.TestCase):
+    def gen_mo_data(self):
+        import io
+        from bl_i18n_utils.utils import I18nMessages
+
+        msgs = I18nMessages(kind='PO', src=PO_TEST)
+        self.assertFalse(msgs.parsing_errors)
+        fh = io.BytesIO()
+        msgs.write_messages_to_mo(fh)
+        return fh.getvalue()
+
+    def test_gnu_translations(self):
+        import gettext
+        import io
+
+        translations = gettext.GNUTranslations(io.BytesIO(self.gen_mo_data()))
+        self.assertEqual(translations.info()["content-type"], "text/plain; charset=UTF-8")
+        self.assertEqual(translations.gettext("Vertex"), "Sommet")
+        self.assertEqual(translations.gettext("Mesh"), "Maillage")
+        # Contexts are stored before the msgid, separated by EOT.
+        self.assertEqual(translations.gettext("Operator\x04Vertex"), "Sommet (opérateur)")
+        self.assertEqual(translations.gettext("ID\x04Vertex"), "Sommet (ID)")
+        self.assertEqual(
+            translations.gettext('Line\nbreak and "quotes"'),
+            'Retour\nà la ligne et "guillemets"',
+        )
+        # Fuzzy and untranslated messages are skipped.
+        self.assertEqual(translations.gettext("Fuzzy"), "Fuzzy")
+        self.assertEqual(translations.gettext("Untranslated"), "Untranslated")
+
+    def test_hash_table(self):
+        import struct
+
+        data = self.gen_mo_data()
+        _magic, _revision, N, O, _T, _S, _H = struct.unpack_from("<7I", data)
+        self.assertEqual(N, 6)
+        keys = []
+        for i in range(N):
+            length, offset = struct.unpack_from("<2I", data, O + i * 8)
+            keys.append(data[offset:offset + length])
+        # gettext falls back to a binary search, which needs sorted strings.
+        self.assertEqual(keys, sorted(keys))
+        self.assertIn(b"Operator\x04Vertex", keys)
+        for i, key in enumerate(keys):
+            self.assertEqual(mo_hash_lookup(data, key), i)
+        self.assertEqual(mo_hash_lookup(data, b"Fuzzy"), -1)
+        self.assertEqual(mo_hash_lookup(data, b"Operator\x04Mesh"), -1)
+
+
+class TestSimilarMsgidIndex(unittest.TestCase):
+    def test_get_best_similar(self):
+        import random
+        from bl_i18n_utils.utils import SimilarMsgidIndex, get_best_similar
+
+        rng = random.Random(0)
+        pool = random_msgids(rng, 500)
+        index = SimilarMsgidIndex(pool)
+
+        keys = random_msgids(rng, 200) + ["", "A", "Vertex", "Add Mesh Object"]
+        for use_similar in (0.75, 0.9, 1.0):
+            for msgid in keys:
+                key = ("", msgid)
+                _key, expected = get_best_similar((key, use_similar, pool))
+                self.assertEqual(
+                    index.get_best_similar(msgid, use_similar), expected,
+                    "msgid %r, use_similar %r" % (msgid, use_similar),
+                )
+
+    def test_empty_pool(self):
+        from bl_i18n_utils.utils import SimilarMsgidIndex
+
+        self.assertIsNone(SimilarMsgidIndex(()).get_best_similar("Vertex", 0.75))
+
+
+if __name__ == '__main__':
+    import sys
+
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
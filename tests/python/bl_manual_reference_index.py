@@ -0,0 +1,100 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --python tests/python/bl_manual_reference_index.py -- --verbose
+import unittest
+
+
+def find_linear(url_mapping, rna_id):
+    # The lookup the index replaces: the first pattern matching wins.
+    from fnmatch import fnmatchcase
+    for i, (pattern, url_suffix) in enumerate(url_mapping):
+        if fnmatchcase(rna_id, pattern):
+            return i, pattern, url_suffix
+    return None
+
+
+def rna_ids_from_patterns(url_mapping):
+    # IDs matching each pattern, almost matching it and sharing its prefix.
+    for pattern, _url_suffix in url_mapping:
+        pattern_base = pattern.replace("*", "").replace("?", "x")
+        yield pattern_base
+        yield pattern_base + ".location"
+        yield pattern_base[:-1]
+        yield pattern_base[:len(pattern_base) // 2]
+
+
+def rna_ids_from_api():
+    import bpy
+    for struct_id in dir(bpy.types):
+        struct = getattr(bpy.types, struct_id)
+        bl_rna = getattr(struct, "bl_rna", None)
+        if bl_rna is None:
+            continue
+        struct_path = "bpy.types.%s" % struct_id
+        yield struct_path
+        for prop in bl_rna.properties:
+            yield "%s.%s" % (struct_path, prop.identifier)
+
+    for submod_id in dir(bpy.ops):
+        op_path = "bpy.ops.%s" % submod_id
+        for op_id in dir(getattr(bpy.ops, submod_id)):
+            yield "%s.%s" % (op_path, op_id)
+
+
+class TestManualURLIndex(unittest.TestCase):
+    def assertFindEqual(self, url_mapping, rna_ids):
+        from bl_operators.wm import _ManualURLIndex
+
+        index = _ManualURLIndex(url_mapping)
+        for rna_id in rna_ids:
+            self.assertEqual(index.find(rna_id), find_linear(url_mapping, rna_id), rna_id)
+
+    def test_manual_mapping(self):
+        import rna_manual_reference
+
+        url_mapping = rna_manual_reference.url_manual_mapping
+        rna_ids = set(rna_ids_from_patterns(url_mapping))
+        rna_ids.update(rna_id.lower() for rna_id in rna_ids_from_api())
+        self.assertFindEqual(url_mapping, sorted(rna_ids))
+
+    def test_patterns(self):
+        # Wildcards other than a trailing '*', duplicate and overlapping patterns.
+        url_mapping = (
+            ("bpy.types.object.location", "exact.html"),
+            ("bpy.types.object.*_lock*", "lock.html"),
+            ("bpy.types.object*", "object.html"),
+            ("bpy.types.object.location", "exact_duplicate.html"),
+            ("bpy.types.obj*", "obj.html"),
+            ("bpy.types.object.rotation_?uler*", "euler.html"),
+            ("bpy.types.object.scale", "scale.html"),
+            ("bpy.types.mesh.[uv]*", "mesh_uv.html"),
+            ("bpy.types.mesh*", "mesh.html"),
+            ("bpy.ops.*", "ops.html"),
+            ("*", "all.html"),
+        )
+        rna_ids = (
+            "bpy.types.object.location",
+            "bpy.types.object.lock_location",
+            "bpy.types.object.use_lock_location",
+            "bpy.types.object.rotation_euler",
+            "bpy.types.object.scale",
+            "bpy.types.objectbase",
+            "bpy.types.obj",
+            "bpy.types.ob",
+            "bpy.types.mesh.uv_layers",
+            "bpy.types.mesh.vertices",
+            "bpy.types.mesh.edges",
+            "bpy.ops.object.delete",
+            "bpy.types",
+            "",
+        )
+        self.assertFindEqual(url_mapping, rna_ids)
+        # Without the catch all pattern some IDs have no match.
+        self.assertFindEqual(url_mapping[:-1], rna_ids)
+
+
+if __name__ == '__main__':
+    import sys
+
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
@@ -33,6 +33,41 @@ class TestBpyPath(unittest.TestCase):
         self.assertEqual(ensure_ext('demoBlend', 'blend', True), 'demoBlendblend')
         self.assertEqual(ensure_ext('demo', '', True), 'demo')
 
+    def test_resolve_ncase_listdir_cache(self):
+        import os
+        import tempfile
+        from bpy.path import listdir_cache, resolve_ncase
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            os.makedirs(os.path.join(tempdir, "Tex", "SUB"))
+            filepath = os.path.join(tempdir, "Tex", "SUB", "Wood.PNG")
+            open(filepath, 'w').close()
+            filepath_ncase = os.path.join(tempdir, "tex", "sub", "wood.png")
+            if os.path.exists(filepath_ncase):
+                self.skipTest("case insensitive file-system")
+
+            expected = resolve_ncase(filepath_ncase)
+            self.assertEqual(expected, filepath)
+            with listdir_cache():
+                # Nested use shares the same cache.
+                with listdir_cache():
+                    self.assertEqual(resolve_ncase(filepath_ncase), expected)
+                self.assertEqual(resolve_ncase(filepath_ncase), expected)
+
+                # Missing files are still reported as missing.
+                filepath_missing = os.path.join(tempdir, "tex", "none.png")
+                self.assertEqual(resolve_ncase(filepath_missing), filepath_missing)
+
+                # Files added while the cache is in use are missed,
+                # as the directory listing is reused.
+                filepath_new = os.path.join(tempdir, "Tex", "SUB", "Stone.PNG")
+                open(filepath_new, 'w').close()
+                filepath_new_ncase = os.path.join(tempdir, "tex", "sub", "stone.png")
+                self.assertEqual(resolve_ncase(filepath_new_ncase), filepath_new_ncase)
+
+            # Found once the cache is cleared.
+            self.assertEqual(resolve_ncase(filepath_new_ncase), filepath_new)
+
 
 if __name__ == '__main__':
     import sys
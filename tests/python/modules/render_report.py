@@ -4,11 +4,13 @@
 # a HTML report showing the differences, for regression testing.
 
 import glob
+import json
 import os
 import pathlib
 import shutil
 import subprocess
 import sys
+import threading
 import time
 
 from . import global_report
@@ -109,7 +111,9 @@ class Report:
         'failed_tests',
         'passed_tests',
         'compare_tests',
-        'compare_engines'
+        'compare_engines',
+        'jobs',
+        'timeout',
     )
 
     def __init__(self, title, output_dir, idiff):
@@ -122,6 +126,10 @@ class Report:
         self.pixelated = False
         self.verbose = os.environ.get("BLENDER_VERBOSE") is not None
         self.update = os.getenv('BLENDER_TEST_UPDATE') is not None
+        # Number of Blender processes to run in parallel.
+        self.jobs = int(os.getenv('BLENDER_TEST_JOBS', "1"))
+        # Timeout in seconds for a single test (0 for no timeout).
+        self.timeout = float(os.getenv('BLENDER_TEST_TIMEOUT', "0"))
 
         if os.environ.get("BLENDER_TEST_COLOR") is not None:
             global COLORS, COLORS_ANSI
@@ -142,6 +150,12 @@ class Report:
     def set_compare_engines(self, engine, other_engine):
         self.compare_engines = (engine, other_engine)
 
+    def set_jobs(self, jobs):
+        self.jobs = jobs
+
+    def set_timeout(self, timeout):
+        self.timeout = timeout
+
     def run(self, dirpath, blender, arguments_cb, batch=False):
         # Run tests and output report.
         dirname = os.path.basename(dirpath)
@@ -407,7 +421,39 @@ class Report:
 
         return not failed
 
-    def _run_tests(self, filepaths, blender, arguments_cb, batch):
+    def _run_command(self, command, output_filepaths):
+        # Run Blender, returning (output, crash, timeout).
+        # The timeout applies to each test: chained tests write their output
+        # in order, so the time of a test starts once the previous output exists.
+        try:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE)
+        except BaseException:
+            return None, True, False
+
+        if not self.timeout:
+            output = process.communicate()[0]
+            return output, process.returncode != 0, False
+
+        index = 0
+        time_test_start = time.time()
+        while True:
+            try:
+                output = process.communicate(timeout=min(self.timeout, 1.0))[0]
+                return output, process.returncode != 0, False
+            except subprocess.TimeoutExpired:
+                pass
+
+            index_prev = index
+            while index < len(output_filepaths) and os.path.exists(output_filepaths[index]):
+                index += 1
+            if index != index_prev:
+                time_test_start = time.time()
+            elif time.time() - time_test_start > self.timeout:
+                process.kill()
+                output = process.communicate()[0]
+                return output, True, True
+
+    def _run_tests(self, filepaths, blender, arguments_cb, batch, test_times=None):
         # Run multiple tests in a single Blender process since startup can be
         # a significant factor. In case of crashes, re-run the remaining tests.
         verbose = os.environ.get("BLENDER_VERBOSE") is not None
@@ -438,14 +484,9 @@ class Report:
                     break
 
             # Run process
-            crash = False
-            output = None
-            try:
-                output = subprocess.check_output(command)
-            except subprocess.CalledProcessError as e:
-                crash = True
-            except BaseException as e:
-                crash = True
+            time_start = time.time()
+            output, crash, timeout = self._run_command(command, output_filepaths)
+            time_elapsed = time.time() - time_start
 
             if verbose:
                 print(" ".join(command))
@@ -453,19 +494,24 @@ class Report:
                     print(output.decode("utf-8"))
 
             # Detect missing filepaths and consider those errors
+            filepaths_done = []
             for filepath, output_filepath in zip(remaining_filepaths[:], output_filepaths):
                 remaining_filepaths.pop(0)
+                testname = test_get_name(filepath)
 
                 if crash:
                     # In case of crash, stop after missing files and re-render remaining
                     if not os.path.exists(output_filepath):
-                        errors.append("CRASH")
-                        print_message("Crash running Blender")
+                        if timeout:
+                            errors.append("TIMEOUT")
+                            print_message("Timeout running Blender")
+                        else:
+                            errors.append("CRASH")
+                            print_message("Crash running Blender")
                         print_message(testname, 'FAILURE', 'FAILED')
+                        filepaths_done.append(filepath)
                         break
 
-                testname = test_get_name(filepath)
-
                 if not os.path.exists(output_filepath) or os.path.getsize(output_filepath) == 0:
                     errors.append("NO OUTPUT")
                     print_message("No render result file found")
@@ -481,8 +527,82 @@ class Report:
                 if os.path.exists(output_filepath):
                     os.remove(output_filepath)
 
+                filepaths_done.append(filepath)
+
+            # Individual times aren't known when chaining tests,
+            # split the time between the tests that ran.
+            if test_times is not None:
+                for filepath in filepaths_done:
+                    test_times[test_get_name(filepath)] = time_elapsed / len(filepaths_done)
+
         return errors
 
+    def _times_filepath(self, dirname):
+        return os.path.join(self.output_dir, dirname, "times.json")
+
+    def _read_times(self, dirname):
+        # Render times from the previous run, used for scheduling.
+        try:
+            with open(self._times_filepath(dirname), "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_times(self, dirname, test_times):
+        filepath = self._times_filepath(dirname)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, "w", encoding="utf-8") as fh:
+            json.dump(test_times, fh, indent=1, sort_keys=True)
+
+    def _run_tests_parallel(self, filepaths, blender, arguments_cb, batch, test_times):
+        # Run tests in multiple Blender processes, slowest tests first
+        # (based on times from the previous run) so the processes finish
+        # at roughly the same time. Each worker runs its tests in separate
+        # processes so a crash or timeout only affects its own tests.
+        times_known = sorted(test_times.values())
+        time_default = times_known[len(times_known) // 2] if times_known else 1.0
+
+        def time_estimate(filepath):
+            return test_times.get(test_get_name(filepath), time_default)
+
+        queue = sorted(filepaths, key=time_estimate, reverse=True)
+        queue.reverse()  # Pop from the end.
+
+        # When chaining tests, give each process enough tests to be worth
+        # the startup time while keeping enough chunks to balance the workers.
+        chunk_time = sum(map(time_estimate, filepaths)) / (self.jobs * 4)
+
+        lock = threading.Lock()
+        results = {}
+        test_times_new = {}
+
+        def worker():
+            while True:
+                with lock:
+                    if not queue:
+                        return
+                    chunk = [queue.pop()]
+                    if batch:
+                        chunk_time_total = time_estimate(chunk[0])
+                        while queue and chunk_time_total < chunk_time:
+                            chunk.append(queue.pop())
+                            chunk_time_total += time_estimate(chunk[-1])
+
+                chunk_times = {}
+                errors = self._run_tests(chunk, blender, arguments_cb, batch, chunk_times)
+                with lock:
+                    results.update(zip(chunk, errors))
+                    test_times_new.update(chunk_times)
+
+        threads = [threading.Thread(target=worker) for _ in range(self.jobs)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        test_times.update(test_times_new)
+        return [results[filepath] for filepath in filepaths]
+
     def _run_all_tests(self, dirname, dirpath, blender, arguments_cb, batch):
         passed_tests = []
         failed_tests = []
@@ -492,7 +612,12 @@ class Report:
                       format(len(all_files)),
                       'SUCCESS', "==========")
         time_start = time.time()
-        errors = self._run_tests(all_files, blender, arguments_cb, batch)
+        test_times = self._read_times(dirname)
+        if self.jobs > 1:
+            errors = self._run_tests_parallel(all_files, blender, arguments_cb, batch, test_times)
+        else:
+            errors = self._run_tests(all_files, blender, arguments_cb, batch, test_times)
+        self._write_times(dirname, test_times)
         for filepath, error in zip(all_files, errors):
             testname = test_get_name(filepath)
             if error: